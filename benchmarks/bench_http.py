@@ -0,0 +1,116 @@
+"""
+Micro-benchmarks of the request hot path, run offline against ``httpx.MockTransport``.
+
+Run from the repository root with ``python -m benchmarks.bench_http``.
+"""
+
+import asyncio
+import logging
+import time
+import timeit
+import tracemalloc
+
+import httpx
+
+from payman.core.gateways.register_gateway import get_gateway_instance, register_gateway
+from payman.core.http.client import AsyncHttpClient
+
+RESPONSE = b'{"result":100,"message":"success","trackId":123456}'
+CONCURRENCY_LEVELS = (1, 10, 100)
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, content=RESPONSE, headers={"Content-Type": "application/json"})
+
+
+class MockedClient(AsyncHttpClient):
+    """AsyncHttpClient whose transport answers in-process instead of over the network."""
+
+    def _build_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler), timeout=self.timeouts)
+
+
+class BenchGateway:
+    def __init__(self, merchant_id: str):
+        self.merchant_id = merchant_id
+
+
+def make_client() -> MockedClient:
+    return MockedClient(
+        base_url="https://gateway.test/v1", share_connections=False, log_level=logging.WARNING
+    )
+
+
+async def _request_loop(client: AsyncHttpClient, calls: int) -> None:
+    for _ in range(calls):
+        await client.request("POST", "/verify", json_data={"merchant": "zibal", "trackId": 1})
+
+
+async def _send_loop(client: AsyncHttpClient, calls: int) -> None:
+    for _ in range(calls):
+        await client._send_request(
+            "POST", "https://gateway.test/v1/verify", {"merchant": "zibal", "trackId": 1}
+        )
+
+
+async def _measure(loop_func, calls: int, concurrency: int = 1) -> dict[str, float]:
+    client = make_client()
+    await loop_func(client, 10)  # warm up the client and pool
+
+    def batch():
+        return asyncio.gather(*(loop_func(client, calls // concurrency) for _ in range(concurrency)))
+
+    start = time.perf_counter()
+    await batch()
+    elapsed = time.perf_counter() - start
+
+    # Memory is measured in a separate pass, tracemalloc distorts timings
+    tracemalloc.start()
+    await batch()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    await client.close()
+
+    return {
+        "us_per_call": elapsed / calls * 1e6,
+        "calls_per_sec": calls / elapsed,
+        "peak_kib": peak / 1024,
+    }
+
+
+def bench_logger(number: int) -> dict[str, float]:
+    client = make_client()
+    body = RESPONSE
+
+    def log_cycle():
+        client.log_request("POST", "https://gateway.test/v1/verify", {"trackId": 1})
+        client.log_response("POST", "https://gateway.test/v1/verify", body, 0.1)
+
+    best = min(timeit.repeat(log_cycle, number=number, repeat=5))
+    return {"us_per_call": best / number * 1e6}
+
+
+def bench_registry(number: int) -> dict[str, float]:
+    register_gateway("bench", "benchmarks.bench_http.BenchGateway")
+    best = min(
+        timeit.repeat(lambda: get_gateway_instance("bench", merchant_id="x"), number=number, repeat=5)
+    )
+    return {"us_per_call": best / number * 1e6}
+
+
+def run(calls: int = 2_000, number: int = 20_000) -> dict[str, dict[str, float]]:
+    results = {
+        "http._send_request": asyncio.run(_measure(_send_loop, calls)),
+        "logger.log_request+log_response": bench_logger(number),
+        "registry.get_gateway_instance": bench_registry(number),
+    }
+    for concurrency in CONCURRENCY_LEVELS:
+        results[f"http.request[c={concurrency}]"] = asyncio.run(
+            _measure(_request_loop, calls, concurrency)
+        )
+    return results
+
+
+if __name__ == "__main__":
+    for name, metrics in run().items():
+        print(name, " ".join(f"{key}={value:.2f}" for key, value in metrics.items()))
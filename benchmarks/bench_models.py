@@ -0,0 +1,69 @@
+"""
+Micro-benchmark of request/response model construction.
+
+Run from the repository root with ``python -m benchmarks.bench_models``.
+"""
+
+import timeit
+
+from pydantic import BaseModel, Field
+
+from payman.utils import parse_response, to_model_instance
+
+
+class VerifyRequest(BaseModel):
+    track_id: int = Field(alias="trackId")
+
+
+class VerifyResponse(BaseModel):
+    result: int
+    message: str
+    amount: int
+    ref_number: int | None = Field(default=None, alias="refNumber")
+    card_number: str | None = Field(default=None, alias="cardNumber")
+    paid_at: str | None = Field(default=None, alias="paidAt")
+
+
+RESPONSE = {
+    "result": 100,
+    "message": "success",
+    "amount": 10_000,
+    "refNumber": 123456,
+    "cardNumber": "62741****44",
+    "paidAt": "2025-01-01T12:00:00",
+}
+
+
+def baseline_to_model_instance(source, model_cls, **overrides):
+    """The previous implementation: copy, merge, model_validate."""
+
+    if isinstance(source, model_cls):
+        return source
+    payload: dict = {}
+    if isinstance(source, dict):
+        payload.update(source)
+    payload.update(overrides)
+    return model_cls.model_validate(payload)
+
+
+CASES = {
+    "request: baseline": lambda: baseline_to_model_instance({"trackId": 1}, VerifyRequest),
+    "request: to_model_instance": lambda: to_model_instance({"trackId": 1}, VerifyRequest),
+    "response: model_validate": lambda: VerifyResponse.model_validate(RESPONSE),
+    "response: parse_response": lambda: parse_response(RESPONSE, VerifyResponse),
+    "response: parse_response strict": lambda: parse_response(RESPONSE, VerifyResponse, "strict"),
+    "response: parse_response construct": lambda: parse_response(RESPONSE, VerifyResponse, "construct"),
+}
+
+
+def run(number: int = 100_000) -> dict[str, dict[str, float]]:
+    results = {}
+    for name, func in CASES.items():
+        best = min(timeit.repeat(func, number=number, repeat=5))
+        results[f"models.{name}"] = {"us_per_call": best / number * 1e6}
+    return results
+
+
+if __name__ == "__main__":
+    for name, metrics in run().items():
+        print(f"{name:<48} {metrics['us_per_call']:8.3f} us/call")
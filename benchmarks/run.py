@@ -0,0 +1,77 @@
+"""
+Run the payman benchmark suite and compare it against a stored baseline.
+
+Usage (from the repository root):
+    python -m benchmarks.run                          # print results
+    python -m benchmarks.run --save baseline.json     # store a baseline
+    python -m benchmarks.run --compare baseline.json  # fail on regressions
+
+Timings are machine dependent: compare baselines recorded on the same machine,
+e.g. before and after a release.
+"""
+
+import argparse
+import json
+import platform
+import sys
+
+from benchmarks import bench_http, bench_models
+
+# Metrics where a higher value is better; everything else is a cost
+HIGHER_IS_BETTER = {"calls_per_sec"}
+
+
+def run_all(quick: bool = False) -> dict[str, dict[str, float]]:
+    scale = 10 if quick else 1
+    results = bench_models.run(number=100_000 // scale)
+    results.update(bench_http.run(calls=2_000 // scale, number=20_000 // scale))
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], tolerance: float
+) -> list[str]:
+    """Return a description of every metric that regressed by more than `tolerance`."""
+
+    regressions = []
+    for name, metrics in results.items():
+        for key, value in metrics.items():
+            reference = baseline.get(name, {}).get(key)
+            if not reference:
+                continue
+            change = (value - reference) / reference
+            if key in HIGHER_IS_BETTER:
+                change = -change
+            if change > tolerance:
+                regressions.append(f"{name} {key}: {reference:.2f} -> {value:.2f} ({change:+.0%})")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--save", metavar="PATH", help="write results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown (default: 0.2)")
+    parser.add_argument("--quick", action="store_true", help="run fewer iterations")
+    args = parser.parse_args(argv)
+
+    results = run_all(quick=args.quick)
+    for name, metrics in results.items():
+        print(f"{name:<48}", "  ".join(f"{key}={value:.2f}" for key, value in metrics.items()))
+
+    if args.save:
+        with open(args.save, "w") as fh:
+            json.dump({"python": platform.python_version(), "results": results}, fh, indent=2)
+
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
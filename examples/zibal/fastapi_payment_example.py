@@ -1,11 +1,22 @@
+from contextlib import asynccontextmanager
+
 from fastapi import Depends, FastAPI, HTTPException
 from fastapi.responses import RedirectResponse, JSONResponse
 
 from payman import Payman, GatewayError
+from payman.core.http import close_shared_clients
 from zibal import Zibal  # for type hint
 from zibal.models import CallbackParams, PaymentRequest, VerifyRequest, VerifyResponse
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Close pooled gateway connections on shutdown
+    await close_shared_clients()
+
+
+app = FastAPI(lifespan=lifespan)
 
 AMOUNT = 10_000
 CALLBACK_URL = "http://127.0.0.1:8000/callback"
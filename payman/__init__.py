@@ -1,10 +1,40 @@
+from typing import TYPE_CHECKING
+
+from ._lazy import lazy_attributes
 from .core.exceptions.base import GatewayError
-from .core.gateways.wrapper import Payman
 
-from .utils import to_model_instance
+if TYPE_CHECKING:
+    from .core.callbacks import CallbackPipeline
+    from .core.deadline import deadline
+    from .core.journal import JournaledGateway, PaymentJournal
+    from .core.reconcile import Reconciler
+    from .core.gateways.router import PaymanRouter
+    from .core.gateways.wrapper import Payman
+    from .core.gateways.warmup import warmup
+    from .utils import to_model_instance
+
+# Imported on first access so `import payman` stays cheap (no httpx/pydantic)
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    "CallbackPipeline": "payman.core.callbacks",
+    "deadline": "payman.core.deadline",
+    "JournaledGateway": "payman.core.journal",
+    "PaymentJournal": "payman.core.journal",
+    "Reconciler": "payman.core.reconcile",
+    "Payman": "payman.core.gateways.wrapper",
+    "PaymanRouter": "payman.core.gateways.router",
+    "to_model_instance": "payman.utils",
+    "warmup": "payman.core.gateways.warmup",
+})
 
 
 __all__ = [
     "Payman",
+    "PaymanRouter",
     "GatewayError",
+    "CallbackPipeline",
+    "PaymentJournal",
+    "JournaledGateway",
+    "Reconciler",
+    "warmup",
+    "deadline",
 ]
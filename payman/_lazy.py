@@ -0,0 +1,34 @@
+from importlib import import_module
+from typing import Any, Callable
+
+
+def lazy_attributes(
+    module_name: str, attributes: dict[str, str]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    Build module-level ``__getattr__`` and ``__dir__`` functions that import
+    public attributes on first access.
+
+    Args:
+        module_name: ``__name__`` of the module exposing the attributes.
+        attributes: Maps each attribute name to the dotted module defining it.
+
+    Returns:
+        The ``(__getattr__, __dir__)`` pair to assign in the module.
+    """
+
+    module_globals = import_module(module_name).__dict__
+
+    def __getattr__(name: str) -> Any:
+        source = attributes.get(name)
+        if source is None:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        value = getattr(import_module(source), name)
+        # Cache on the module so later lookups skip __getattr__
+        module_globals[name] = value
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(module_globals) | set(attributes))
+
+    return __getattr__, __dir__
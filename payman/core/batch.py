@@ -0,0 +1,107 @@
+import asyncio
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, NamedTuple
+
+
+class BatchResult(NamedTuple):
+    """
+    Outcome of one item of a bulk gateway call.
+
+    Attributes:
+        index: Position of the item in the input.
+        request: The input item as given.
+        response: Gateway response, or None if the call failed.
+        error: Exception raised for this item, or None on success.
+    """
+
+    index: int
+    request: Any
+    response: Any = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+async def _aiter(items: Iterable | AsyncIterable) -> AsyncIterator:
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def bounded_map(
+    func: Callable[[Any], Awaitable[Any]],
+    items: Iterable | AsyncIterable,
+    concurrency: int = 10,
+) -> AsyncIterator[BatchResult]:
+    """
+    Call `func` on every item with at most `concurrency` calls in flight.
+
+    Items are pulled lazily from a (sync or async) iterable, so arbitrarily
+    long inputs run in constant memory. Results are yielded in completion
+    order; an exception raised by `func` is reported on its `BatchResult`
+    instead of aborting the batch. Closing the iterator early cancels the
+    calls still in flight.
+
+    Args:
+        func: Coroutine function called with each item.
+        items: Iterable or async iterable of inputs.
+        concurrency: Maximum number of concurrent calls.
+    """
+
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    source = _aiter(items)
+    source_lock = asyncio.Lock()
+    # One slot per item that is in flight or waiting to be consumed
+    slots = asyncio.Semaphore(concurrency)
+    results: asyncio.Queue = asyncio.Queue()
+    counter = 0
+    finished = object()
+
+    async def worker() -> None:
+        nonlocal counter
+        try:
+            while True:
+                await slots.acquire()
+                async with source_lock:
+                    try:
+                        item = await source.__anext__()
+                    except StopAsyncIteration:
+                        slots.release()
+                        return
+                    index = counter
+                    counter += 1
+                try:
+                    response = await func(item)
+                except Exception as exc:
+                    results.put_nowait(BatchResult(index, item, error=exc))
+                else:
+                    results.put_nowait(BatchResult(index, item, response))
+        except Exception as exc:
+            # The input iterable itself failed
+            results.put_nowait(exc)
+        finally:
+            results.put_nowait(finished)
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    running = len(workers)
+    try:
+        while running:
+            result = await results.get()
+            if result is finished:
+                running -= 1
+            elif isinstance(result, Exception):
+                raise result
+            else:
+                slots.release()
+                yield result
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        await source.aclose()
@@ -0,0 +1,264 @@
+import asyncio
+import inspect
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+from payman.core.batch import BatchResult
+from payman.core.gateways.router import TOKEN_FIELDS, get_token
+from payman.interfaces.callback import CallbackBase
+from payman.interfaces.gateway_base import GatewayInterface
+
+logger = logging.getLogger(__name__)
+
+
+def verify_request_from(source: Any) -> dict:
+    """Build a ``verify_payment`` request from the payment token field of a callback or response."""
+
+    for field in TOKEN_FIELDS:
+        if isinstance(source, dict):
+            value = source.get(field)
+        else:
+            value = getattr(source, field, None)
+        if value is not None:
+            return {field: value}
+    raise ValueError(f"No payment token found on {source!r}")
+
+
+class CallbackPipeline:
+    """
+    Queues payment callbacks and verifies them with a bounded pool of workers.
+
+    HTTP handlers `submit` the parsed callback and get back a future, so they
+    can acknowledge immediately (or await the verification) while the number
+    of concurrent `verify_payment` calls stays under control. Callbacks whose
+    `is_success` is false resolve to None without touching the gateway.
+    Duplicate callbacks for the same payment token share one verification,
+    both while it is queued or running and for `dedupe_ttl` seconds after.
+
+    Usage:
+        >>> pipeline = CallbackPipeline(Payman("zibal", merchant_id="..."), workers=4)
+        >>> future = await pipeline.submit(callback)
+        >>> verify_response = await future
+
+    Args:
+        gateway: Gateway whose `verify_many` verifies the callbacks.
+        workers: Number of concurrent worker tasks.
+        max_queue: Queued callbacks before `submit` waits (backpressure).
+        batch_size: Callbacks a worker takes from the queue and verifies together.
+        dedupe_ttl: Seconds a finished verification is reused for duplicate callbacks.
+        request_factory: Builds the `verify_payment` request from a callback;
+            defaults to its payment token field (`track_id`, `authority`, ...).
+        on_result: Called with the callback and its `BatchResult` when
+            verification finishes; may be a coroutine function.
+    """
+
+    def __init__(
+        self,
+        gateway: GatewayInterface,
+        workers: int = 4,
+        max_queue: int = 1000,
+        batch_size: int = 10,
+        dedupe_ttl: float = 300.0,
+        request_factory: Callable[[Any], Any] = verify_request_from,
+        on_result: Callable[[Any, BatchResult], Any] | None = None,
+    ):
+        if workers < 1 or batch_size < 1:
+            raise ValueError("workers and batch_size must be at least 1")
+
+        self.gateway = gateway
+        self.workers = workers
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.dedupe_ttl = dedupe_ttl
+        self.request_factory = request_factory
+        self.on_result = on_result
+        self.submitted = 0
+        self.deduplicated = 0
+        self.verified = 0
+        self.failed = 0
+        self._queue: asyncio.Queue | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._futures: OrderedDict[Any, tuple[asyncio.Future, float]] = OrderedDict()
+
+    def __repr__(self) -> str:
+        queued = self._queue.qsize() if self._queue is not None else 0
+        return f"<CallbackPipeline workers={self.workers} queued={queued}>"
+
+    async def __aenter__(self) -> "CallbackPipeline":
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    def start(self) -> None:
+        """Start the worker tasks on the running event loop."""
+
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(self.max_queue)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    def _reuse(self, token: Any) -> asyncio.Future | None:
+        futures = self._futures
+        now = time.monotonic()
+        # Drop finished verifications that outlived the dedupe window
+        while futures:
+            future, expires = next(iter(futures.values()))
+            if not future.done() or expires > now:
+                break
+            futures.popitem(last=False)
+
+        entry = futures.get(token)
+        if entry is None:
+            return None
+        future, expires = entry
+        if future.done() and expires <= now:
+            del futures[token]
+            return None
+        return future
+
+    def _prepare(self, callback: CallbackBase) -> tuple[asyncio.Future, tuple | None]:
+        """Return the callback's future and the queue item, or None if nothing is to be queued."""
+
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        self.submitted += 1
+        if not callback.is_success:
+            future.set_result(None)
+            return future, None
+
+        request = self.request_factory(callback)
+        token = get_token(callback)
+        if token is not None:
+            existing = self._reuse(token)
+            if existing is not None:
+                self.deduplicated += 1
+                return existing, None
+            # Expiry is set once the verification finishes
+            self._futures[token] = (future, float("inf"))
+        return future, (token, callback, request, future)
+
+    async def submit(self, callback: CallbackBase) -> asyncio.Future:
+        """
+        Queue `callback` for verification, waiting while the queue is full.
+
+        Returns:
+            A future resolving to the `verify_payment` response (None for
+            unsuccessful callbacks) or raising its error.
+        """
+
+        future, item = self._prepare(callback)
+        if item is not None:
+            try:
+                await self._queue.put(item)
+            except BaseException:
+                # Duplicates may already be waiting on this future
+                self._futures.pop(item[0], None)
+                future.cancel()
+                raise
+        return future
+
+    def submit_nowait(self, callback: CallbackBase) -> asyncio.Future:
+        """
+        Queue `callback` without waiting; for handlers that shed load instead.
+
+        Raises:
+            asyncio.QueueFull: If the queue is full.
+        """
+
+        future, item = self._prepare(callback)
+        if item is not None:
+            try:
+                self._queue.put_nowait(item)
+            except asyncio.QueueFull:
+                self._futures.pop(item[0], None)
+                raise
+        return future
+
+    async def _worker(self) -> None:
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await self._verify(batch)
+            except asyncio.CancelledError:
+                # Stopped mid-batch (close without draining): release the waiters
+                for token, _, _, future in batch:
+                    if not future.done():
+                        self._futures.pop(token, None)
+                        future.cancel()
+                raise
+            except Exception as exc:
+                logger.exception(f"Callback batch of {len(batch)} failed: {exc}")
+                for token, _, _, future in batch:
+                    self._futures.pop(token, None)
+                    if not future.done():
+                        future.set_exception(exc)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _verify(self, batch: list[tuple]) -> None:
+        requests = [request for _, _, request, _ in batch]
+        stream = self.gateway.verify_many(requests, concurrency=len(batch))
+        try:
+            async for result in stream:
+                token, callback, _, future = batch[result.index]
+                if result.ok:
+                    self.verified += 1
+                    if not future.done():
+                        future.set_result(result.response)
+                else:
+                    self.failed += 1
+                    if not future.done():
+                        future.set_exception(result.error)
+                    # Let a retried callback try again instead of reusing the failure
+                    self._futures.pop(token, None)
+                if token in self._futures:
+                    self._futures[token] = (future, time.monotonic() + self.dedupe_ttl)
+                await self._notify(callback, result)
+        finally:
+            await stream.aclose()
+
+    async def _notify(self, callback: Any, result: BatchResult) -> None:
+        if self.on_result is None:
+            return
+        try:
+            outcome = self.on_result(callback, result)
+            if inspect.isawaitable(outcome):
+                await outcome
+        except Exception as exc:
+            logger.exception(f"on_result failed for {callback!r}: {exc}")
+
+    async def join(self) -> None:
+        """Wait until every queued callback has been verified."""
+
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self, drain: bool = True) -> None:
+        """
+        Stop the workers.
+
+        Args:
+            drain: Verify the queued callbacks first; otherwise their futures are cancelled.
+        """
+
+        if not self._tasks:
+            return
+        if drain:
+            await self.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        while not self._queue.empty():
+            token, _, _, future = self._queue.get_nowait()
+            self._futures.pop(token, None)
+            future.cancel()
+        self._tasks = []
+        self._queue = None
@@ -0,0 +1,58 @@
+import time
+from contextvars import ContextVar
+
+# Absolute `time.monotonic()` by which the current operation must finish
+_deadline: ContextVar[float | None] = ContextVar("payman_deadline", default=None)
+
+
+def remaining() -> float | None:
+    """Return the seconds left before the current deadline, or None without one."""
+
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+class deadline:
+    """
+    Time budget for all gateway calls made inside the block.
+
+    Requests started within the block shrink their per-attempt timeouts to
+    the time left and stop retrying once it is spent, raising
+    `DeadlineExceededError` if no attempt can start. The budget follows the
+    current task and the tasks it creates. Nested deadlines can only shorten
+    the budget, never extend it. Code inside the block is not cancelled.
+
+    Usage:
+        >>> async with payman.deadline(2.5):
+        ...     response = await gateway.verify_payment(track_id=track_id)
+
+    Args:
+        seconds: Time budget from entering the block.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self._token = None
+
+    def __enter__(self) -> "deadline":
+        at = time.monotonic() + self.seconds
+        current = _deadline.get()
+        if current is not None:
+            at = min(at, current)
+        self._token = _deadline.set(at)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        _deadline.reset(self._token)
+
+    async def __aenter__(self) -> "deadline":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.__exit__(exc_type, exc_val, exc_tb)
+
+    @property
+    def remaining(self) -> float | None:
+        return remaining()
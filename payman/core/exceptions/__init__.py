@@ -1 +1 @@
-from .base import GatewayError
+from .base import CircuitOpenError, ConcurrencyLimitExceededError, GatewayError, RateLimitExceededError
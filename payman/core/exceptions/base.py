@@ -2,3 +2,30 @@ class GatewayError(Exception):
     """Base class for all gateway errors."""
 
     pass
+
+
+class CircuitOpenError(GatewayError):
+    """Request rejected without being sent because the endpoint's circuit is open."""
+
+    def __init__(self, key: str, retry_after: float):
+        super().__init__(f"Circuit open for {key}, retry in {retry_after:.2f}s")
+        self.key = key
+        self.retry_after = retry_after
+
+
+class RateLimitExceededError(GatewayError):
+    """Request rejected without being sent because its rate limit would be exceeded."""
+
+    def __init__(self, key: str, retry_after: float):
+        super().__init__(f"Rate limit exceeded for {key}, retry in {retry_after:.2f}s")
+        self.key = key
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimitExceededError(GatewayError):
+    """Request shed without being sent because too many requests are in flight or queued."""
+
+    def __init__(self, limit: int, queued: int):
+        super().__init__(f"Concurrency limit {limit} reached with {queued} requests queued")
+        self.limit = limit
+        self.queued = queued
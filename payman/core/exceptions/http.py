@@ -1,3 +1,6 @@
+from typing import Mapping
+
+
 class HttpClientError(Exception):
     """Base exception for HTTP client errors."""
 
@@ -9,11 +12,22 @@ class TimeoutError(HttpClientError):
 class HttpStatusError(HttpClientError):
     """HTTP response status code was not successful."""
 
-    def __init__(self, status_code: int, message: str, body: str | None = None):
+    def __init__(
+        self,
+        status_code: int,
+        message: str,
+        body: str | None = None,
+        headers: Mapping[str, str] | None = None,
+    ):
         super().__init__(message)
         self.status_code = status_code
         self.body = body
+        self.headers = headers or {}
 
 
 class InvalidJsonError(HttpClientError):
     """Response JSON could not be decoded."""
+
+
+class DeadlineExceededError(TimeoutError):
+    """The caller's deadline expired before the request could be (re)tried."""
@@ -0,0 +1,103 @@
+import hashlib
+import json
+import logging
+import os
+import sys
+from importlib.metadata import entry_points
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "payman.gateways"
+INDEX_VERSION = 1
+
+
+def default_index_path() -> Path:
+    """Return the plugin index location, honoring ``PAYMAN_CACHE_DIR`` and ``XDG_CACHE_HOME``."""
+
+    cache_dir = os.environ.get("PAYMAN_CACHE_DIR")
+    if not cache_dir:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        cache_dir = Path(base) / "payman"
+    return Path(cache_dir) / "gateways.json"
+
+
+def environment_fingerprint(paths: list[str] | None = None) -> str:
+    """
+    Fingerprint the installed distributions without reading their metadata.
+
+    Installing, upgrading or removing a distribution adds or removes a
+    ``*.dist-info`` directory, which bumps the modification time of the
+    directory on ``sys.path`` that holds it.
+    """
+
+    digest = hashlib.sha1(sys.version.encode())
+    for entry in paths if paths is not None else sys.path:
+        try:
+            mtime = os.stat(entry or ".").st_mtime_ns
+        except OSError:
+            mtime = 0
+        digest.update(f"{entry}\0{mtime}\n".encode())
+    return digest.hexdigest()
+
+
+def scan_entry_points(group: str = ENTRY_POINT_GROUP) -> dict[str, str]:
+    """Map gateway names to dotted import paths declared in the entry point `group`."""
+
+    return {
+        entry_point.name.lower(): entry_point.value.replace(":", ".").strip()
+        for entry_point in entry_points(group=group)
+    }
+
+
+def discover_gateways(
+    index_path: str | Path | None = None,
+    refresh: bool = False,
+    group: str = ENTRY_POINT_GROUP,
+) -> dict[str, str]:
+    """
+    Return gateways advertised by installed packages, using the on-disk index when fresh.
+
+    Gateway packages declare themselves in their ``pyproject.toml``:
+
+        [project.entry-points."payman.gateways"]
+        zibal = "zibal:Zibal"
+
+    Only names and import paths are read; the gateway classes themselves are
+    imported later, when first requested.
+
+    Args:
+        index_path: Where to keep the index; defaults to ``default_index_path()``.
+        refresh: Ignore the index and rescan the entry points.
+        group: Entry point group to scan.
+
+    Returns:
+        A mapping of gateway name to dotted import path.
+    """
+
+    path = Path(index_path) if index_path else default_index_path()
+    fingerprint = environment_fingerprint()
+
+    if not refresh:
+        try:
+            index = json.loads(path.read_text())
+            if (
+                index.get("version") == INDEX_VERSION
+                and index.get("group") == group
+                and index.get("fingerprint") == fingerprint
+            ):
+                return dict(index["gateways"])
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+
+    gateways = scan_entry_points(group)
+    index = {"version": INDEX_VERSION, "group": group, "fingerprint": fingerprint, "gateways": gateways}
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temp_path.write_text(json.dumps(index))
+        os.replace(temp_path, path)
+    except OSError as exc:
+        # A read-only home directory only costs a rescan next time
+        logger.debug(f"Could not write gateway index {path}: {exc}")
+    return gateways
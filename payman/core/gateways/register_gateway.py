@@ -1,13 +1,19 @@
 from importlib import import_module
-from typing import Type, cast
+from typing import TYPE_CHECKING, Type, cast
 
-from payman.interfaces.gateway_base import GatewayInterface
+from .discovery import discover_gateways
+
+if TYPE_CHECKING:
+    from payman.interfaces.gateway_base import GatewayInterface
 
 # Gateway registry: maps gateway name to its class or import path
-_GATEWAY_REGISTRY: dict[str, Type[GatewayInterface] | str] = {
+_GATEWAY_REGISTRY: dict[str, "Type[GatewayInterface] | str"] = {
     "zibal": "zibal.Zibal",
 }
 
+# Whether installed gateway packages have been merged into the registry
+_discovered = False
+
 
 def register_gateway(name: str, import_path: str) -> None:
     """
@@ -22,7 +28,28 @@ def register_gateway(name: str, import_path: str) -> None:
     _GATEWAY_REGISTRY[name.lower()] = import_path
 
 
-def _load_class(import_path: str) -> Type[GatewayInterface]:
+def load_plugins(refresh: bool = False) -> list[str]:
+    """
+    Merge gateways advertised through the ``payman.gateways`` entry point group
+    into the registry. Explicitly registered gateways take precedence.
+
+    Runs automatically the first time an unknown gateway is requested.
+
+    Args:
+        refresh: Rescan installed packages instead of trusting the cached index.
+
+    Returns:
+        Names of all registered gateways.
+    """
+
+    global _discovered
+    for name, import_path in discover_gateways(refresh=refresh).items():
+        _GATEWAY_REGISTRY.setdefault(name, import_path)
+    _discovered = True
+    return list(_GATEWAY_REGISTRY)
+
+
+def _load_class(import_path: str) -> "Type[GatewayInterface]":
     """
     Import a class dynamically from a dotted path.
 
@@ -43,19 +70,18 @@ def _load_class(import_path: str) -> Type[GatewayInterface]:
         cls = getattr(module, class_name)
     except AttributeError as exc:
         raise ImportError(f"Class '{class_name}' not found in module '{module_name}'") from exc
-    return cast(Type[GatewayInterface], cls)
+    return cast("Type[GatewayInterface]", cls)
 
 
-def get_gateway_instance(name: str, **kwargs) -> GatewayInterface:
+def get_gateway_class(name: str) -> "Type[GatewayInterface]":
     """
-    Return an instance of the requested payment gateway.
+    Return the class of the requested payment gateway, importing it on first use.
 
     Args:
         name: Gateway name (case-insensitive)
-        **kwargs: Keyword arguments for the gateway constructor
 
     Returns:
-        GatewayInterface instance
+        Class type implementing GatewayInterface.
 
     Raises:
         ValueError: if gateway is not registered
@@ -64,6 +90,9 @@ def get_gateway_instance(name: str, **kwargs) -> GatewayInterface:
 
     key = name.lower()
     registry_entry = _GATEWAY_REGISTRY.get(key)
+    if not registry_entry and not _discovered:
+        load_plugins()
+        registry_entry = _GATEWAY_REGISTRY.get(key)
     if not registry_entry:
         available = ", ".join(_GATEWAY_REGISTRY.keys())
         raise ValueError(f"Gateway '{name}' not supported. Available: [{available}]")
@@ -72,9 +101,27 @@ def get_gateway_instance(name: str, **kwargs) -> GatewayInterface:
         cls = _load_class(registry_entry)
         # cache class to avoid re-import
         _GATEWAY_REGISTRY[key] = cls
-    else:
-        cls = registry_entry
+        return cls
+    return registry_entry
+
+
+def get_gateway_instance(name: str, **kwargs) -> "GatewayInterface":
+    """
+    Return an instance of the requested payment gateway.
+
+    Args:
+        name: Gateway name (case-insensitive)
+        **kwargs: Keyword arguments for the gateway constructor
+
+    Returns:
+        GatewayInterface instance
+
+    Raises:
+        ValueError: if gateway is not registered
+        ImportError: if gateway module/class is missing
+    """
 
+    cls = get_gateway_class(name)
     try:
         return cls(**kwargs)
     except TypeError as exc:
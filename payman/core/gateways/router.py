@@ -0,0 +1,251 @@
+import asyncio
+import random
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Literal
+
+from payman.core.exceptions.base import GatewayError
+from payman.core.exceptions.http import HttpClientError
+from payman.interfaces.gateway_base import GatewayInterface
+
+TOKEN_FIELDS = ("track_id", "trackId", "authority", "token")
+
+# Errors that say something about a gateway's health and justify trying
+# another one; anything else (e.g. a ValueError from bad caller input) would
+# fail the same way everywhere and is raised as is.
+FAILOVER_ERRORS = (GatewayError, HttpClientError, OSError)
+
+
+def get_token(source: Any) -> str | int | None:
+    """Find the payment token (e.g. Zibal `track_id`, ZarinPal `authority`) in a model or dict."""
+
+    if source is None:
+        return None
+    if isinstance(source, dict):
+        for field in TOKEN_FIELDS:
+            if source.get(field) is not None:
+                return source[field]
+        return None
+    for field in TOKEN_FIELDS:
+        value = getattr(source, field, None)
+        if value is not None:
+            return value
+    return None
+
+
+class GatewayStats:
+    """
+    Exponentially weighted latency and error rate of one gateway.
+
+    Args:
+        alpha: Weight of the newest observation.
+    """
+
+    __slots__ = ("alpha", "latency", "error_rate", "calls", "checked_at")
+
+    def __init__(self, alpha: float = 0.2):
+        self.alpha = alpha
+        self.latency: float | None = None
+        self.error_rate = 0.0
+        self.calls = 0
+        # Monotonic time the gateway last received a call
+        self.checked_at = 0.0
+
+    def record(self, duration: float, failed: bool) -> None:
+        alpha = self.alpha
+        self.calls += 1
+        self.error_rate += alpha * ((1.0 if failed else 0.0) - self.error_rate)
+        if not failed:
+            if self.latency is None:
+                self.latency = duration
+            else:
+                self.latency += alpha * (duration - self.latency)
+
+
+class PaymanRouter(GatewayInterface):
+    """
+    Routes payments across several gateways by latency and health.
+
+    New payments go to the best gateway according to `policy`; verification and
+    redirect URLs are pinned to the gateway that issued the payment token. Pins
+    live in memory; after a restart, restore them from your own records with `pin`.
+
+    Usage:
+        >>> router = PaymanRouter({
+        ...     "zibal": Payman("zibal", merchant_id="..."),
+        ...     "zarinpal": Payman("zarinpal", merchant_id="..."),
+        ... })
+        >>> response = await router.initiate_payment(amount=10_000, callback_url="...")
+        >>> url = router.get_payment_redirect_url(response.track_id)
+        >>> result = await router.verify_payment(track_id=response.track_id)
+
+    Args:
+        gateways: Gateway instances by name.
+        policy: "least_latency" picks the lowest EWMA latency, "weighted" picks
+            randomly with weights favoring fast, healthy gateways.
+        weights: Static weights per gateway for the weighted policy (default 1).
+        max_error_rate: Gateways above this EWMA error rate are skipped while a
+            healthier one exists.
+        probe_interval: A gateway that has not received a payment for this
+            many seconds gets the next one as a probe, so its statistics are
+            refreshed and a recovered or no longer slow gateway is routed to
+            again. None disables probing.
+        failover: Retry initiation on the next gateway when one fails with a
+            gateway or transport error.
+        alpha: EWMA smoothing factor.
+        max_pinned: Maximum number of remembered token-to-gateway pins.
+        token_getter: Extracts the payment token from a request or response.
+    """
+
+    def __init__(
+        self,
+        gateways: dict[str, GatewayInterface],
+        policy: Literal["least_latency", "weighted"] = "least_latency",
+        weights: dict[str, float] | None = None,
+        max_error_rate: float = 0.5,
+        probe_interval: float | None = 30.0,
+        failover: bool = True,
+        alpha: float = 0.2,
+        max_pinned: int = 100_000,
+        token_getter: Callable[[Any], str | int | None] = get_token,
+    ):
+        if not gateways:
+            raise ValueError("PaymanRouter needs at least one gateway")
+        if policy not in ("least_latency", "weighted"):
+            raise ValueError(f"Unknown routing policy '{policy}'")
+
+        self.gateways = dict(gateways)
+        self.policy = policy
+        self.weights = weights or {}
+        self.max_error_rate = max_error_rate
+        self.probe_interval = probe_interval
+        self.failover = failover
+        self.max_pinned = max_pinned
+        self.token_getter = token_getter
+        self.stats = {name: GatewayStats(alpha) for name in self.gateways}
+        self._pins: OrderedDict[str, str] = OrderedDict()
+
+    def __repr__(self) -> str:
+        return f"<PaymanRouter gateways={list(self.gateways)} policy={self.policy!r}>"
+
+    def rank(self) -> list[str]:
+        """Return gateway names, best candidate first."""
+
+        healthy = [name for name, stats in self.stats.items() if stats.error_rate <= self.max_error_rate]
+        candidates = healthy or list(self.stats)
+
+        def latency(name: str) -> float:
+            # Gateways without samples sort first, so each gets measured
+            return self.stats[name].latency or 0.0
+
+        if self.policy == "least_latency":
+            ranked = sorted(candidates, key=latency)
+        else:
+            scores = {
+                name: self.weights.get(name, 1.0)
+                * (1.0 - self.stats[name].error_rate)
+                / max(latency(name), 0.001)
+                for name in candidates
+            }
+            ranked = []
+            while scores:
+                names = list(scores)
+                total = sum(scores.values())
+                if total > 0:
+                    pick = random.choices(names, weights=[scores[n] for n in names])[0]
+                else:
+                    pick = random.choice(names)
+                ranked.append(pick)
+                del scores[pick]
+
+        return ranked + [name for name in self.stats if name not in ranked]
+
+    def _due_probe(self) -> str | None:
+        """Return a measured gateway left idle for `probe_interval`, marking it probed."""
+
+        if self.probe_interval is None:
+            return None
+        now = time.monotonic()
+        for name, stats in self.stats.items():
+            if stats.calls and now - stats.checked_at >= self.probe_interval:
+                # Claimed now, so concurrent payments do not all probe it
+                stats.checked_at = now
+                return name
+        return None
+
+    def pinned_name(self, token: str | int) -> str:
+        """Return the name of the gateway that issued `token`."""
+
+        name = self._pins.get(str(token))
+        if name is None:
+            raise KeyError(f"No gateway is pinned for token {token!r}")
+        return name
+
+    def gateway_for(self, token: str | int) -> GatewayInterface:
+        """Return the gateway that issued `token`."""
+
+        return self.gateways[self.pinned_name(token)]
+
+    def pin(self, token: str | int, name: str) -> None:
+        """Remember that `token` was issued by gateway `name`."""
+
+        pins = self._pins
+        pins[str(token)] = name
+        pins.move_to_end(str(token))
+        while len(pins) > self.max_pinned:
+            pins.popitem(last=False)
+
+    async def warmup(self, connections: int = 1) -> int:
+        """Warm up every routed gateway concurrently."""
+
+        opened = await asyncio.gather(
+            *(gateway.warmup(connections) for gateway in self.gateways.values())
+        )
+        return sum(opened)
+
+    async def _call(self, name: str, method: str, request: Any, **kwargs) -> Any:
+        stats = self.stats[name]
+        start_time = stats.checked_at = time.monotonic()
+        try:
+            response = await getattr(self.gateways[name], method)(request, **kwargs)
+        except FAILOVER_ERRORS:
+            stats.record(time.monotonic() - start_time, failed=True)
+            raise
+        stats.record(time.monotonic() - start_time, failed=False)
+        return response
+
+    async def initiate_payment(self, request: Any = None, **kwargs) -> Any:
+        """Initiate a payment on the best gateway and pin its token to that gateway."""
+
+        ranked = self.rank()
+        probe = self._due_probe()
+        if probe is not None:
+            ranked.remove(probe)
+            ranked.insert(0, probe)
+        if not self.failover:
+            ranked = ranked[:1]
+
+        for index, name in enumerate(ranked):
+            try:
+                response = await self._call(name, "initiate_payment", request, **kwargs)
+            except FAILOVER_ERRORS:
+                if index == len(ranked) - 1:
+                    raise
+                continue
+            token = self.token_getter(response)
+            if token is not None:
+                self.pin(token, name)
+            return response
+
+    async def verify_payment(self, request: Any = None, **kwargs) -> Any:
+        """Verify a payment on the gateway that issued its token."""
+
+        token = self.token_getter(request)
+        if token is None:
+            token = self.token_getter(kwargs)
+        if token is None:
+            raise ValueError("Cannot route verify_payment: no payment token in request")
+        return await self._call(self.pinned_name(token), "verify_payment", request, **kwargs)
+
+    def get_payment_redirect_url(self, token: str | int) -> str:
+        return self.gateway_for(token).get_payment_redirect_url(token)
@@ -0,0 +1,132 @@
+import asyncio
+import atexit
+import inspect
+import threading
+from typing import Any, Coroutine, Iterator
+
+from payman.interfaces.gateway_base import GatewayInterface
+
+
+class LoopThread:
+    """
+    A long-lived event loop running in a daemon thread.
+
+    Coroutines submitted from any thread run on this one loop, so the HTTP
+    clients and pooled connections they use persist between calls.
+    """
+
+    def __init__(self, name: str = "payman-loop"):
+        self.name = name
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            with self._lock:
+                if self._loop is None or self._loop.is_closed():
+                    self._start()
+                loop = self._loop
+        return loop
+
+    def _start(self) -> None:
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run() -> None:
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+        self._thread.start()
+        ready.wait()
+        self._loop = loop
+
+    def run(self, coro: Coroutine, timeout: float | None = None) -> Any:
+        """Run `coro` on the background loop and block until it finishes."""
+
+        loop = self.loop
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("Cannot block on the payman loop thread from inside it")
+        return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+    def stop(self) -> None:
+        """Close the HTTP clients opened on the loop and stop the loop thread."""
+
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None or loop.is_closed():
+                return
+            # Finalizes the client pools' loop watchers, which close their clients
+            asyncio.run_coroutine_threadsafe(loop.shutdown_asyncgens(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+            self._loop = self._thread = None
+
+
+default_loop_thread = LoopThread()
+atexit.register(default_loop_thread.stop)
+
+
+class SyncGateway:
+    """
+    Blocking facade over an async gateway.
+
+    Every coroutine method of the wrapped gateway becomes a plain method that
+    runs on a shared background event loop, so WSGI code (Django, Flask, ...)
+    gets pooled keep-alive connections instead of creating a new loop and
+    client on every ``asyncio.run``. Safe to share between threads.
+
+    Usage:
+        >>> pay = Payman.sync("zibal", merchant_id="xyz")
+        >>> response = pay.verify_payment(track_id=123)
+
+    Args:
+        gateway: The async gateway instance to wrap.
+        loop_thread: Loop thread to run calls on; defaults to the process-wide one.
+    """
+
+    def __init__(self, gateway: GatewayInterface, loop_thread: LoopThread | None = None):
+        self.gateway = gateway
+        self.loop_thread = loop_thread or default_loop_thread
+
+    def __repr__(self) -> str:
+        return f"<SyncGateway {self.gateway!r}>"
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.gateway, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            if inspect.iscoroutinefunction(attr):
+                return self.loop_thread.run(attr(*args, **kwargs))
+            result = attr(*args, **kwargs)
+            if inspect.isasyncgen(result):
+                return self._iterate(result)
+            return result
+
+        call.__name__ = name
+        call.__doc__ = attr.__doc__
+        return call
+
+    def _iterate(self, stream) -> Iterator:
+        async def next_item():
+            return await stream.__anext__()
+
+        async def close():
+            await stream.aclose()
+
+        try:
+            while True:
+                try:
+                    yield self.loop_thread.run(next_item())
+                except StopAsyncIteration:
+                    return
+        finally:
+            self.loop_thread.run(close())
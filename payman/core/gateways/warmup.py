@@ -0,0 +1,36 @@
+import asyncio
+from typing import TYPE_CHECKING, Iterable
+
+from .register_gateway import get_gateway_class
+
+if TYPE_CHECKING:
+    from payman.interfaces.gateway_base import GatewayInterface
+
+
+async def warmup(gateways: Iterable["GatewayInterface | str"], connections: int = 1) -> list[int]:
+    """
+    Warm up gateways before a new process receives traffic.
+
+    Gateway names only import the gateway class; gateway instances also build
+    their model validators and open `connections` pooled connections to their
+    hosts (see `GatewayInterface.warmup`). Instances are warmed concurrently.
+
+    Usage:
+        >>> gateway = Payman("zibal", merchant_id="...")
+        >>> await payman.warmup([gateway, "zarinpal"], connections=4)
+
+    Args:
+        gateways: Gateway instances or registered gateway names.
+        connections: Connections to open per HTTP client.
+
+    Returns:
+        The number of connections opened for each entry, in input order.
+    """
+
+    async def warm(gateway: "GatewayInterface | str") -> int:
+        if isinstance(gateway, str):
+            get_gateway_class(gateway)
+            return 0
+        return await gateway.warmup(connections)
+
+    return list(await asyncio.gather(*(warm(gateway) for gateway in gateways)))
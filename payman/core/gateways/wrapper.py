@@ -1,13 +1,15 @@
 from typing import TYPE_CHECKING, Literal, overload
 
-from payman.interfaces.gateway_base import GatewayInterface
-
 from .register_gateway import get_gateway_instance
 
 if TYPE_CHECKING:
     from zarinpal import ZarinPal
     from zibal import Zibal
 
+    from payman.interfaces.gateway_base import GatewayInterface
+
+    from .sync import SyncGateway
+
 
 class Payman:
     """
@@ -25,6 +27,7 @@ class Payman:
     Usage:
         >>> zibal = Payman("zibal", merchant_id="xyz")
         >>> zarinpal = Payman("zarinpal", merchant_id="abc")
+        >>> blocking_zibal = Payman.sync("zibal", merchant_id="xyz")
 
     Overloads:
         - Payman("zibal", merchant_id=..., **kwargs) -> Zibal
@@ -48,7 +51,20 @@ class Payman:
     @overload
     def __new__(cls, name: Literal["zibal"], *, merchant_id: str, **kwargs) -> "Zibal": ...
     @overload
-    def __new__(cls, name: str, **kwargs) -> GatewayInterface: ...
+    def __new__(cls, name: str, **kwargs) -> "GatewayInterface": ...
 
-    def __new__(cls, name: str, **kwargs) -> GatewayInterface:
+    def __new__(cls, name: str, **kwargs) -> "GatewayInterface":
         return get_gateway_instance(name, **kwargs)
+
+    @classmethod
+    def sync(cls, name: str, **kwargs) -> "SyncGateway":
+        """
+        Create a gateway wrapped in a blocking, thread-safe facade for sync code.
+
+        Calls run on a persistent background event loop, so connections are
+        pooled across calls.
+        """
+
+        from .sync import SyncGateway
+
+        return SyncGateway(get_gateway_instance(name, **kwargs))
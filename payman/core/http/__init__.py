@@ -1 +1,46 @@
-from .client import AsyncHttpClient
+from typing import TYPE_CHECKING
+
+from ..._lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from .breaker import CircuitBreaker
+    from .cache import MemoryCacheBackend, ResponseCache, SQLiteCacheBackend
+    from .client import AsyncHttpClient
+    from .codec import MsgspecCodec, OrjsonCodec, StdlibJsonCodec
+    from .concurrency import AIMDLimit, ConcurrencyLimiter, GradientLimit
+    from .hedging import HedgePolicy
+    from .metrics import MetricsHook, MetricsRegistry, RequestEvent
+    from .pool import ClientPool, close_shared_clients, shared_pool
+    from .ratelimit import RateLimiter
+    from .retry import RetryBudget, RetryPolicy, SharedRetryBudget
+    from .shared_state import MemoryStateBackend, SQLiteStateBackend
+    from .singleflight import SingleFlight
+
+# Imported on first access, so using one piece does not load httpx for all of them
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    "AsyncHttpClient": "payman.core.http.client",
+    "ClientPool": "payman.core.http.pool",
+    "close_shared_clients": "payman.core.http.pool",
+    "shared_pool": "payman.core.http.pool",
+    "RetryBudget": "payman.core.http.retry",
+    "RetryPolicy": "payman.core.http.retry",
+    "SharedRetryBudget": "payman.core.http.retry",
+    "MemoryStateBackend": "payman.core.http.shared_state",
+    "SQLiteStateBackend": "payman.core.http.shared_state",
+    "CircuitBreaker": "payman.core.http.breaker",
+    "SingleFlight": "payman.core.http.singleflight",
+    "MemoryCacheBackend": "payman.core.http.cache",
+    "ResponseCache": "payman.core.http.cache",
+    "SQLiteCacheBackend": "payman.core.http.cache",
+    "MetricsHook": "payman.core.http.metrics",
+    "MetricsRegistry": "payman.core.http.metrics",
+    "RequestEvent": "payman.core.http.metrics",
+    "MsgspecCodec": "payman.core.http.codec",
+    "OrjsonCodec": "payman.core.http.codec",
+    "StdlibJsonCodec": "payman.core.http.codec",
+    "HedgePolicy": "payman.core.http.hedging",
+    "RateLimiter": "payman.core.http.ratelimit",
+    "AIMDLimit": "payman.core.http.concurrency",
+    "ConcurrencyLimiter": "payman.core.http.concurrency",
+    "GradientLimit": "payman.core.http.concurrency",
+})
@@ -0,0 +1,228 @@
+import time
+from collections import deque
+
+from payman.core.exceptions.base import CircuitOpenError
+from payman.core.exceptions.http import DeadlineExceededError, HttpClientError, HttpStatusError
+
+from ...interfaces.shared_state import SharedStateBackend
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class Circuit:
+    """
+    State of a single circuit (one gateway endpoint).
+
+    Outcomes of the last `window_size` calls are kept in a rolling window. The
+    circuit opens when the failure rate or the slow-call rate crosses its
+    threshold, rejects calls for `reset_timeout` seconds, then lets a limited
+    number of trial calls through (half-open) to decide whether to close again.
+    """
+
+    def __init__(self, key: str, breaker: "CircuitBreaker"):
+        self.key = key
+        self.breaker = breaker
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self._window: deque[tuple[bool, bool]] = deque(maxlen=breaker.window_size)
+        self._trials = 0
+        self._trial_successes = 0
+
+    def before_call(self) -> None:
+        """
+        Admit a call or raise `CircuitOpenError` without touching the network.
+        """
+
+        if self.state == CLOSED:
+            return
+
+        breaker = self.breaker
+        if self.state == OPEN:
+            remaining = self.opened_at + breaker.reset_timeout - time.monotonic()
+            if remaining > 0:
+                raise CircuitOpenError(self.key, remaining)
+            self.state = HALF_OPEN
+            self._trials = 0
+            self._trial_successes = 0
+
+        if self._trials >= breaker.half_open_max_calls:
+            raise CircuitOpenError(self.key, 0.0)
+        self._trials += 1
+
+    def record(self, failed: bool, duration: float) -> None:
+        """Record the outcome of an admitted call."""
+
+        breaker = self.breaker
+        slow = breaker.slow_call_duration is not None and duration >= breaker.slow_call_duration
+
+        if self.state == HALF_OPEN:
+            self._trials -= 1
+            if failed or slow:
+                self._open()
+                return
+            self._trial_successes += 1
+            if self._trial_successes >= breaker.half_open_max_calls:
+                self.state = CLOSED
+                self._window.clear()
+            return
+
+        if self.state == OPEN:
+            return
+
+        window = self._window
+        window.append((failed, slow))
+        if len(window) < breaker.min_calls:
+            return
+        failures = sum(1 for f, _ in window if f)
+        slow_calls = sum(1 for _, s in window if s)
+        if (
+            failures / len(window) >= breaker.failure_rate_threshold
+            or slow_calls / len(window) >= breaker.slow_call_rate_threshold
+        ):
+            self._open()
+
+    def release(self) -> None:
+        """Give back a half-open trial slot for a call that never completed."""
+
+        if self.state == HALF_OPEN and self._trials > 0:
+            self._trials -= 1
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self._window.clear()
+
+
+class SharedCircuit(Circuit):
+    """
+    `Circuit` whose state lives in a `SharedStateBackend`, so every process on
+    the host sees the same health: failures seen by one worker count towards
+    opening the circuit for all of them.
+    """
+
+    def __init__(self, key: str, breaker: "CircuitBreaker", backend: SharedStateBackend):
+        super().__init__(key, breaker)
+        self.backend = backend
+
+    def _shared(self, operation):
+        def update(state: dict | None):
+            # Stored times are wall-clock; monotonic clocks differ between processes
+            now = time.time()
+            offset = now - time.monotonic()
+            self._window.clear()
+            if state is None:
+                self.state, self.opened_at = CLOSED, 0.0
+                self._trial_successes = 0
+                admitted = []
+            else:
+                self.state = state["state"]
+                self.opened_at = state["opened_at"] - offset
+                self._window.extend(tuple(outcome) for outcome in state["window"])
+                self._trial_successes = state["trial_successes"]
+                # Trials admitted by a worker that died mid-call are never
+                # recorded or released; reclaim their slots after reset_timeout
+                admitted = [
+                    at for at in state.get("trials_admitted_at", [])
+                    if now - at < self.breaker.reset_timeout
+                ]
+            self._trials = len(admitted)
+            before = (self.state, self.opened_at, list(self._window), admitted, self._trial_successes)
+
+            error = None
+            try:
+                operation()
+            except CircuitOpenError as exc:
+                error = exc
+
+            admitted = admitted[max(0, len(admitted) - self._trials):]
+            admitted += [now] * (self._trials - len(admitted))
+            if (self.state, self.opened_at, list(self._window), admitted, self._trial_successes) == before:
+                # Nothing changed (e.g. a call admitted by a closed circuit): no write needed
+                return state, error
+            return {
+                "state": self.state,
+                "opened_at": self.opened_at + offset,
+                "window": list(self._window),
+                "trials_admitted_at": admitted,
+                "trial_successes": self._trial_successes,
+            }, error
+
+        error = self.backend.transact(f"circuit:{self.key}", update)
+        if error is not None:
+            raise error
+
+    def before_call(self) -> None:
+        self._shared(super().before_call)
+
+    def record(self, failed: bool, duration: float) -> None:
+        record = super().record
+        self._shared(lambda: record(failed, duration))
+
+    def release(self) -> None:
+        self._shared(super().release)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker keyed per gateway endpoint.
+
+    Share one instance between gateway instances so they see the same health
+    state; each distinct endpoint URL gets its own `Circuit`.
+
+    Args:
+        failure_rate_threshold: Failure ratio in the window that opens the circuit.
+        slow_call_duration: Calls taking at least this many seconds count as slow.
+            None disables latency-based tripping.
+        slow_call_rate_threshold: Slow-call ratio in the window that opens the circuit.
+        window_size: Number of recent calls considered.
+        min_calls: Calls required in the window before the circuit can open.
+        reset_timeout: Seconds the circuit stays open before trial calls.
+        half_open_max_calls: Trial calls admitted, and required to succeed, while half-open.
+        shared_state: Keep circuit state in a `SharedStateBackend`, e.g. a
+            `SQLiteStateBackend`, so all worker processes on the host share it.
+    """
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        slow_call_duration: float | None = None,
+        slow_call_rate_threshold: float = 0.5,
+        window_size: int = 20,
+        min_calls: int = 10,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        shared_state: SharedStateBackend | None = None,
+    ):
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.shared_state = shared_state
+        self._circuits: dict[str, Circuit] = {}
+
+    def circuit(self, key: str) -> Circuit:
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            if self.shared_state is not None:
+                circuit = SharedCircuit(key, self, self.shared_state)
+            else:
+                circuit = Circuit(key, self)
+            self._circuits[key] = circuit
+        return circuit
+
+    def is_failure(self, exc: HttpClientError) -> bool:
+        """
+        Whether an error reflects gateway health. Client-side 4xx errors and
+        expired caller deadlines do not.
+        """
+
+        if isinstance(exc, DeadlineExceededError):
+            return False
+        if isinstance(exc, HttpStatusError):
+            return exc.status_code >= 500
+        return True
@@ -0,0 +1,178 @@
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+from ...interfaces.cache import CacheBackend
+from .singleflight import request_key
+
+# Success codes that mark a finished transaction: Zibal reports them in
+# `result` (201 = already verified), ZarinPal in `data.code` (101 = already verified).
+TERMINAL_RESULT_CODES = frozenset({100, 101, 201})
+
+# Payment states of a verified payment. Inquiry responses carry a success code
+# for the inquiry itself and the payment state separately: Zibal in `status`
+# (1 = paid and verified), ZarinPal in `data.status`.
+SETTLED_STATUSES = frozenset({1, "VERIFIED"})
+
+
+def is_terminal_success(response: dict) -> bool:
+    """
+    Whether a verify/inquiry response describes a finished, successful payment.
+
+    A response that reports a payment state (inquiry) must also be in a
+    settled state; a pending or unverified payment is not terminal even though
+    the inquiry itself succeeded.
+    """
+
+    data = response.get("data")
+    if "result" in response:
+        code, status = response["result"], response.get("status")
+    elif isinstance(data, dict):
+        code, status = data.get("code"), data.get("status")
+    else:
+        return False
+    return code in TERMINAL_RESULT_CODES and (status is None or status in SETTLED_STATUSES)
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    In-process LRU cache with per-entry TTL.
+
+    Args:
+        maxsize: Maximum number of entries; the least recently used is evicted first.
+    """
+
+    def __init__(self, maxsize: int = 10_000):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Cache backend stored in a local SQLite database.
+
+    Entries survive restarts and are shared by every process on the host using
+    the same file. Values must be JSON-serializable.
+
+    Args:
+        path: Database file path.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS payman_cache "
+            "(key TEXT PRIMARY KEY, expires_at REAL NOT NULL, value TEXT NOT NULL)"
+        )
+
+    def get(self, key: str) -> Any | None:
+        row = self._conn.execute(
+            "SELECT value FROM payman_cache WHERE key = ? AND expires_at > ?",
+            (key, time.time()),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO payman_cache (key, expires_at, value) VALUES (?, ?, ?)",
+            (key, time.time() + ttl, json.dumps(value)),
+        )
+
+    def delete(self, key: str) -> None:
+        self._conn.execute("DELETE FROM payman_cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        self._conn.execute("DELETE FROM payman_cache")
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class ResponseCache:
+    """
+    Cache for responses of idempotent gateway lookups such as verify and inquiry.
+
+    Only requests whose path ends with one of `endpoints` are considered, and
+    only responses accepted by `is_cacheable` (by default: terminal, successful
+    results) are stored, so pending or failed transactions are always re-fetched.
+    Cached responses are shared between callers and must be treated as read-only.
+
+    Args:
+        backend: Storage backend; defaults to an in-memory LRU.
+        ttl: Seconds a response stays cached.
+        endpoints: Path suffixes of the cacheable endpoints.
+        is_cacheable: Predicate deciding whether a response may be stored.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend | None = None,
+        ttl: float = 3600.0,
+        endpoints: tuple[str, ...] = ("/verify", "/inquiry"),
+        is_cacheable: Callable[[dict], bool] = is_terminal_success,
+    ):
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.ttl = ttl
+        self.endpoints = tuple(endpoint.rstrip("/") for endpoint in endpoints)
+        self.is_cacheable = is_cacheable
+        self.hits = 0
+        self.misses = 0
+
+    def handles(self, url: str) -> bool:
+        return url.partition("?")[0].rstrip("/").endswith(self.endpoints)
+
+    @staticmethod
+    def key(method: str, url: str, json_data: Any = None, **kwargs) -> str:
+        return "\x1f".join(request_key(method, url, json_data, **kwargs))
+
+    def get(self, key: str) -> Any | None:
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def store(self, key: str, response: Any) -> None:
+        if isinstance(response, dict) and self.is_cacheable(response):
+            self.backend.set(key, response, self.ttl)
+
+    def invalidate(self, method: str, url: str, json_data: Any = None, **kwargs) -> None:
+        """Drop the cached response of one request."""
+
+        self.backend.delete(self.key(method, url, json_data, **kwargs))
+
+    def clear(self) -> None:
+        self.backend.clear()
+        self.hits = 0
+        self.misses = 0
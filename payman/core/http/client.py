@@ -1,23 +1,78 @@
 import asyncio
 import time
-from json.decoder import JSONDecodeError
+from typing import Sequence
 
 import httpx
 
+from payman.core.exceptions.base import (
+    CircuitOpenError,
+    ConcurrencyLimitExceededError,
+    RateLimitExceededError,
+)
 from payman.core.exceptions.http import (
+    DeadlineExceededError,
     HttpClientError,
     HttpStatusError,
     InvalidJsonError,
     TimeoutError
 )
 
+from ..deadline import deadline as scoped_deadline
+from ..deadline import remaining
+from ...interfaces.codec import JsonCodec
 from ...interfaces.http import HttpClientProtocol
+from .breaker import CircuitBreaker
+from .cache import ResponseCache
+from .codec import default_codec
+from .concurrency import ConcurrencyLimiter
+from .hedging import HedgePolicy
 from .logger import LoggerMixin
+from .metrics import MetricsHook, RequestEvent
+from .pool import ClientPool, origin_of, shared_pool
+from .ratelimit import RateLimiter
+from .retry import RetryBudget, RetryPolicy, parse_retry_after, shared_retry_budget
+from .singleflight import SingleFlight, request_key
+from .tracing import PhaseTimer
+
+
+# Responses signalling that the gateway is overloaded
+OVERLOAD_STATUSES = frozenset({429, 503})
 
 
 class AsyncHttpClient(HttpClientProtocol, LoggerMixin):
     """
     Asynchronous HTTP client with retry, logging, timeout and session management.
+
+    Args:
+        base_url: Base URL prepended to relative endpoints.
+        timeout: Default timeout in seconds for every phase of a request.
+        share_connections: Borrow connections from the process-wide pool.
+        connect_timeout, read_timeout, write_timeout, pool_timeout:
+            Per-phase overrides of `timeout`.
+        max_connections: Maximum open connections per upstream host.
+        max_keepalive_connections: Maximum idle keep-alive connections per host.
+        keepalive_expiry: Seconds an idle keep-alive connection is kept open.
+        http2: Enable HTTP/2 multiplexing (requires ``payman[http2]``).
+        max_retries, retry_delay: Shorthand for the default `RetryPolicy`.
+        retry_policy: Custom `RetryPolicy`; overrides `max_retries` and `retry_delay`.
+        retry_budget: Token bucket capping retries to a fraction of traffic; defaults
+            to one budget per upstream origin, shared by every client in the process.
+        circuit_breaker: `CircuitBreaker` guarding each endpoint; share one instance
+            across gateway instances so they see the same health state.
+        single_flight: `SingleFlight` group coalescing identical in-flight requests.
+        response_cache: `ResponseCache` for terminal verify/inquiry responses.
+        metrics_hooks: `MetricsHook` instances notified of every request attempt,
+            e.g. a shared `MetricsRegistry`.
+        trace_timings: Record per-phase timings (pool wait, connect, TLS, TTFB, body)
+            of every attempt on `RequestEvent.timings`.
+        json_codec: `JsonCodec` encoding request bodies and decoding responses,
+            e.g. `OrjsonCodec()`; defaults to the standard library.
+        hedging: `HedgePolicy` sending a second copy of slow idempotent requests.
+        rate_limiter: `RateLimiter` every attempt must get a token from before it is sent.
+        rate_limit_key: Quota the client draws on, e.g. ``"zibal:<merchant_id>"``;
+            defaults to the upstream host.
+        concurrency_limiter: `ConcurrencyLimiter` capping in-flight requests with a
+            limit adapted to the latency and errors seen by `_send_request`.
     """
 
     def __init__(
@@ -30,65 +85,365 @@ class AsyncHttpClient(HttpClientProtocol, LoggerMixin):
         log_level: int = 20,
         log_req_body: bool = True,
         log_resp_body: bool = True,
+        share_connections: bool = True,
+        connect_timeout: float | None = None,
+        read_timeout: float | None = None,
+        write_timeout: float | None = None,
+        pool_timeout: float | None = None,
+        max_connections: int | None = 100,
+        max_keepalive_connections: int | None = 20,
+        keepalive_expiry: float | None = 5.0,
+        http2: bool = False,
+        retry_policy: RetryPolicy | None = None,
+        retry_budget: RetryBudget | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        single_flight: SingleFlight | None = None,
+        response_cache: ResponseCache | None = None,
+        metrics_hooks: Sequence[MetricsHook] = (),
+        trace_timings: bool = False,
+        json_codec: JsonCodec | None = None,
+        hedging: HedgePolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+        rate_limit_key: str | None = None,
+        concurrency_limiter: ConcurrencyLimiter | None = None,
     ):
+
         LoggerMixin.__init__(self, log_level)
         self.base_url = base_url.rstrip("/") if base_url else ""
         self.timeout = timeout
         self.slow_request_threshold = slow_request_threshold
-        self.max_retries = max_retries
+        self.retry_policy = retry_policy or RetryPolicy(max_retries=max_retries, base_delay=retry_delay)
+        self._origin = origin_of(self.base_url) if self.base_url else ""
+        self.retry_budget = retry_budget or shared_retry_budget(self._origin)
+        self.max_retries = self.retry_policy.max_retries
         self.retry_delay = retry_delay
         self.log_req_body = log_req_body
         self.log_resp_body = log_resp_body
+        self.share_connections = share_connections
+        self.timeouts = httpx.Timeout(
+            timeout,
+            connect=timeout if connect_timeout is None else connect_timeout,
+            read=timeout if read_timeout is None else read_timeout,
+            write=timeout if write_timeout is None else write_timeout,
+            pool=timeout if pool_timeout is None else pool_timeout,
+        )
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2
+        self.circuit_breaker = circuit_breaker
+        self.single_flight = single_flight
+        self.response_cache = response_cache
+        self.metrics_hooks = tuple(metrics_hooks)
+        self.trace_timings = trace_timings
+        self.json_codec = json_codec or default_codec
+        self.hedging = hedging
+        self.rate_limiter = rate_limiter
+        self.rate_limit_key = rate_limit_key
+        self.concurrency_limiter = concurrency_limiter
 
-        self._client: httpx.AsyncClient | None = None
-        self._client_lock = asyncio.Lock()
+        # Private clients, one per event loop, when connections are not shared
+        self._private_pool = ClientPool()
 
     async def __aenter__(self) -> "AsyncHttpClient":
-        await self._ensure_client()
+        if not self.share_connections:
+            await self._ensure_client()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
         await self.close()
 
-    async def _ensure_client(self) -> httpx.AsyncClient:
-        async with self._client_lock:
-            if self._client is None:
-                self._client = httpx.AsyncClient(timeout=self.timeout)
-            return self._client
+    def _settings_key(self) -> tuple:
+        """Hashable description of the settings that shape the underlying client."""
+
+        timeouts, limits = self.timeouts, self.limits
+        return (
+            timeouts.connect,
+            timeouts.read,
+            timeouts.write,
+            timeouts.pool,
+            limits.max_connections,
+            limits.max_keepalive_connections,
+            limits.keepalive_expiry,
+            self.http2,
+        )
+
+    def _build_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(timeout=self.timeouts, limits=self.limits, http2=self.http2)
+
+    async def _ensure_client(self, url: str | None = None) -> httpx.AsyncClient:
+        if self.share_connections:
+            origin = self._origin if url is None else origin_of(url)
+            return shared_pool.get(origin, self._settings_key(), self._build_client)
+        return self._private_pool.get("", self._settings_key(), self._build_client)
+
+    async def warmup(self, connections: int = 1, url: str | None = None) -> int:
+        """
+        Open keep-alive connections ahead of the first real request.
+
+        Resolves DNS and completes the TCP and TLS handshakes by sending
+        `connections` concurrent ``HEAD`` requests, so the pool holds that many
+        idle connections afterwards. Any HTTP status counts as success.
+
+        Args:
+            connections: Connections to open; capped by `max_keepalive_connections`.
+            url: URL to probe; defaults to the root of `base_url`'s origin.
+
+        Returns:
+            The number of probes that reached the server.
+        """
+
+        target = url or f"{self._origin}/"
+        client = await self._ensure_client(target)
+        if self.http2:
+            connections = 1
+        elif self.limits.max_keepalive_connections is not None:
+            connections = min(connections, self.limits.max_keepalive_connections)
+
+        async def probe() -> bool:
+            try:
+                await client.request("HEAD", target)
+            except httpx.HTTPError as exc:
+                self.logger.warning(f"Warmup of {target} failed: {exc}")
+                return False
+            return True
+
+        results = await asyncio.gather(*(probe() for _ in range(max(connections, 0))))
+        opened = sum(results)
+        self.logger.info(f"Warmed up {opened}/{len(results)} connections to {target}")
+        return opened
 
     async def close(self) -> None:
-        async with self._client_lock:
-            if self._client is not None:
-                await self._client.aclose()
-                self._client = None
+        """
+        Close the private client of the running event loop, if any.
+
+        Shared connection pools stay open for other instances; close them with
+        `close_shared_clients` at application shutdown. Clients are also closed
+        automatically when their event loop shuts down (e.g. ``asyncio.run``
+        returning).
+        """
+
+        await self._private_pool.aclose()
+
+    def _timeouts_within(self, budget: float) -> httpx.Timeout:
+        """Per-phase timeouts shrunk to fit the `budget` seconds left of a deadline."""
+
+        timeouts = self.timeouts
+
+        def fit(value: float | None) -> float:
+            return budget if value is None else min(value, budget)
+
+        return httpx.Timeout(
+            connect=fit(timeouts.connect),
+            read=fit(timeouts.read),
+            write=fit(timeouts.write),
+            pool=fit(timeouts.pool),
+        )
+
+    def _limit_key(self, url: str) -> str:
+        return self.rate_limit_key or self._origin or origin_of(url)
+
+    def _resolve_url(self, endpoint: str) -> str:
+        if endpoint.startswith("http://") or endpoint.startswith("https://"):
+            return endpoint
+        return f"{self.base_url}/{endpoint.lstrip('/')}"
 
     async def request(
-        self, method: str, endpoint: str, json_data: dict | None = None, **kwargs
+        self,
+        method: str,
+        endpoint: str,
+        json_data: dict | None = None,
+        deadline: float | None = None,
+        **kwargs,
+    ) -> dict:
+        if deadline is not None:
+            # Same as wrapping the call in `payman.deadline(deadline)`
+            with scoped_deadline(deadline):
+                return await self.request(method, endpoint, json_data, **kwargs)
+
+        url = self._resolve_url(endpoint)
+        cache = self.response_cache
+        if cache is not None and cache.handles(url):
+            key = cache.key(method, url, json_data, **kwargs)
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+            response = await self._dispatch(method, url, json_data, **kwargs)
+            cache.store(key, response)
+            return response
+        return await self._dispatch(method, url, json_data, **kwargs)
+
+    async def _dispatch(
+        self, method: str, url: str, json_data: dict | None = None, **kwargs
+    ) -> dict:
+        if self.single_flight is not None:
+            key = request_key(method, url, json_data, **kwargs)
+            return await self.single_flight.do(
+                key, lambda: self._request_with_retries(method, url, json_data, **kwargs)
+            )
+        return await self._request_with_retries(method, url, json_data, **kwargs)
+
+    async def _request_with_retries(
+        self, method: str, url: str, json_data: dict | None = None, **kwargs
     ) -> dict:
-        last_error: Exception | None = None
-        for attempt in range(self.max_retries + 1):
+        policy = self.retry_policy
+        self.retry_budget.deposit()
+        hedging = self.hedging
+        send = self._attempt
+        if hedging is not None and hedging.handles(url):
+            hedging.budget.deposit()
+            send = self._hedged_attempt
+        attempt = 0
+        while True:
+            left = remaining()
+            if left is not None and left <= 0:
+                raise DeadlineExceededError(
+                    f"Deadline exceeded before attempt {attempt + 1} of {method.upper()} {url}"
+                )
             try:
-                return await self._send_request(method, endpoint, json_data, **kwargs)
+                return await send(method, url, attempt, json_data, **kwargs)
             except HttpClientError as exc:
-                last_error = exc
-                if attempt < self.max_retries:
+                if attempt >= policy.max_retries or not policy.is_retryable(exc):
+                    raise
+                delay = policy.get_delay(attempt, exc)
+                left = remaining()
+                if left is not None and delay >= left:
                     self.logger.warning(
-                        f"Retry {attempt+1}/{self.max_retries} due to {exc}"
+                        f"Not retrying {method.upper()} {url}: {left:.2f}s left of the deadline"
                     )
-                    await asyncio.sleep(self.retry_delay)
-                else:
                     raise
-        raise last_error
+                if not self.retry_budget.withdraw():
+                    raise
+                attempt += 1
+                self.logger.warning(
+                    f"Retry {attempt}/{policy.max_retries} in {delay:.2f}s due to {exc}"
+                )
+                await asyncio.sleep(delay)
 
-    async def _send_request(
-        self, method: str, endpoint: str, json_data: dict | None = None, **kwargs
+    async def _hedged_attempt(
+        self, method: str, url: str, attempt: int, json_data: dict | None = None, **kwargs
     ) -> dict:
-        client = await self._ensure_client()
+        """
+        Send an attempt and, if it is slower than the hedge delay, race an
+        identical one against it. The loser is cancelled.
+        """
 
-        if endpoint.startswith("http://") or endpoint.startswith("https://"):
-            url = endpoint
-        else:
-            url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        hedging = self.hedging
+        start_time = time.monotonic()
+        tasks = {asyncio.ensure_future(self._attempt(method, url, attempt, json_data, **kwargs))}
+        try:
+            delay = hedging.delay_for(url)
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done and hedging.budget.withdraw():
+                    hedging.hedged += 1
+                    self.logger.info(f"Hedging {method.upper()} {url} after {delay:.2f}s")
+                    tasks.add(asyncio.ensure_future(
+                        self._attempt(method, url, attempt, json_data, **kwargs)
+                    ))
+
+            first_error: BaseException | None = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        hedging.observe(url, time.monotonic() - start_time)
+                        return task.result()
+                    first_error = first_error or error
+            raise first_error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _attempt(
+        self, method: str, url: str, attempt: int, json_data: dict | None = None, **kwargs
+    ) -> dict:
+        """
+        Send a single attempt through the circuit breaker, if configured,
+        reporting its lifecycle to the metrics hooks.
+        """
+
+        hooks = self.metrics_hooks
+        event = None
+        if hooks:
+            event = RequestEvent(method, url, attempt)
+            for hook in hooks:
+                hook.on_request_start(event)
+            if event.headers:
+                kwargs["headers"] = {**kwargs.get("headers", {}), **event.headers}
+
+        timer = None
+        if self.trace_timings:
+            timer = PhaseTimer()
+            kwargs["extensions"] = {**kwargs.get("extensions", {}), "trace": timer}
+
+        breaker = self.circuit_breaker
+        circuit = None
+        limiter = self.rate_limiter
+        start_time = time.monotonic()
+        try:
+            # An open circuit fails fast, without queueing for or spending a token
+            if breaker is not None:
+                admitted = breaker.circuit(url.partition("?")[0])
+                admitted.before_call()
+                circuit = admitted
+            if limiter is not None:
+                await limiter.acquire(self._limit_key(url), url.partition("?")[0])
+                start_time = time.monotonic()
+            response = await self._send_request(method, url, json_data, **kwargs)
+            if event is not None:
+                event.status = response.status_code
+            result = self._parse_response(url, response)
+        except (
+            HttpClientError,
+            CircuitOpenError,
+            RateLimitExceededError,
+            ConcurrencyLimitExceededError,
+        ) as exc:
+            duration = time.monotonic() - start_time
+            if circuit is not None:
+                if isinstance(exc, HttpClientError) and not isinstance(exc, DeadlineExceededError):
+                    circuit.record(breaker.is_failure(exc), duration)
+                else:
+                    # Shed or expired before reaching the gateway: says nothing
+                    # about its health, but frees a half-open trial slot
+                    circuit.release()
+            if limiter is not None and isinstance(exc, HttpStatusError) and exc.status_code == 429:
+                retry_after = parse_retry_after(exc.headers.get("retry-after"))
+                limiter.throttled(self._limit_key(url), url.partition("?")[0], retry_after or 1.0)
+            if event is not None:
+                event.duration = duration
+                event.error = exc
+                if timer is not None:
+                    event.timings = timer.finish()
+                for hook in hooks:
+                    hook.on_request_error(event)
+            raise
+        except BaseException:
+            if circuit is not None:
+                circuit.release()
+            raise
+
+        duration = time.monotonic() - start_time
+        if circuit is not None:
+            circuit.record(False, duration)
+        if event is not None:
+            event.duration = duration
+            if timer is not None:
+                event.timings = timer.finish()
+            for hook in hooks:
+                hook.on_request_end(event)
+        elif timer is not None:
+            self.logger.debug(f"Timings: {method.upper()} {url} {timer.finish()}")
+        return result
+
+    async def _send_request(
+        self, method: str, url: str, json_data: dict | None = None, **kwargs
+    ) -> httpx.Response:
+        client = await self._ensure_client(url)
 
         headers = kwargs.pop("headers", {})
         kwargs["headers"] = {
@@ -100,27 +455,62 @@ class AsyncHttpClient(HttpClientProtocol, LoggerMixin):
         if self.log_req_body:
             self.log_request(method, url, json_data, debug=True)
 
+        content = None if json_data is None else self.json_codec.dumps(json_data)
+        limiter = self.concurrency_limiter
+        if limiter is not None:
+            await limiter.acquire()
         start_time = time.monotonic()
+        # Whether the caller's deadline, not the gateway timeouts, bounds this attempt
+        shortened = False
         try:
-            response = await client.request(method.upper(), url, json=json_data, **kwargs)
-            duration = time.monotonic() - start_time
-
-            if self.log_resp_body:
-                self.log_response(method, url, response.text, duration)
-
-            if not response.status_code // 100 == 2:
-                raise HttpStatusError(
-                    response.status_code,
-                    f"HTTP error {response.status_code} from {url}",
-                    response.text,
-                )
-
-            try:
-                return response.json()
-            except JSONDecodeError:
-                raise InvalidJsonError(f"Invalid JSON from {url}")
+            # Measured after the limiter queue, so waiting there is not
+            # charged to the request's own timeouts
+            left = remaining()
+            if left is not None and "timeout" not in kwargs:
+                if left <= 0:
+                    raise DeadlineExceededError(f"Deadline exceeded before {method.upper()} {url}")
+                kwargs["timeout"] = self._timeouts_within(left)
+                shortened = kwargs["timeout"] != self.timeouts
 
+            timer = kwargs.get("extensions", {}).get("trace")
+            if isinstance(timer, PhaseTimer) and (limiter is not None or self.rate_limiter is not None):
+                timer.begin()
+            response = await client.request(method.upper(), url, content=content, **kwargs)
         except httpx.TimeoutException as exc:
+            if shortened:
+                # The caller ran out of time; the gateway may be perfectly healthy
+                if limiter is not None:
+                    limiter.release(None)
+                raise DeadlineExceededError(f"Deadline exceeded during {method.upper()} {url}: {exc}")
+            if limiter is not None:
+                limiter.release(time.monotonic() - start_time, dropped=True)
             raise TimeoutError(str(exc))
         except httpx.RequestError as exc:
+            if limiter is not None:
+                limiter.release(time.monotonic() - start_time, dropped=True)
             raise HttpClientError(str(exc))
+        except BaseException:
+            if limiter is not None:
+                limiter.release(None)
+            raise
+        duration = time.monotonic() - start_time
+        if limiter is not None:
+            limiter.release(duration, dropped=response.status_code in OVERLOAD_STATUSES)
+
+        if self.log_resp_body:
+            self.log_response(method, url, response.content, duration)
+        return response
+
+    def _parse_response(self, url: str, response: httpx.Response) -> dict:
+        if not response.status_code // 100 == 2:
+            raise HttpStatusError(
+                response.status_code,
+                f"HTTP error {response.status_code} from {url}",
+                response.text,
+                response.headers,
+            )
+
+        try:
+            return self.json_codec.loads(response.content)
+        except ValueError:
+            raise InvalidJsonError(f"Invalid JSON from {url}")
@@ -0,0 +1,56 @@
+import json
+from typing import Any
+
+from ...interfaces.codec import JsonCodec
+
+
+class StdlibJsonCodec(JsonCodec):
+    """JSON codec built on the standard library ``json`` module."""
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """JSON codec built on ``orjson`` (``pip install payman[orjson]``)."""
+
+    def __init__(self):
+        try:
+            import orjson
+        except ImportError as exc:
+            raise ImportError("OrjsonCodec requires orjson: pip install payman[orjson]") from exc
+        self._orjson = orjson
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj)
+
+    def loads(self, data: bytes) -> Any:
+        return self._orjson.loads(data)
+
+
+class MsgspecCodec(JsonCodec):
+    """JSON codec built on ``msgspec`` (``pip install payman[msgspec]``)."""
+
+    def __init__(self):
+        try:
+            import msgspec
+        except ImportError as exc:
+            raise ImportError("MsgspecCodec requires msgspec: pip install payman[msgspec]") from exc
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+        self._decode_error = msgspec.DecodeError
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data: bytes) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._decode_error as exc:
+            raise ValueError(str(exc)) from exc
+
+
+default_codec = StdlibJsonCodec()
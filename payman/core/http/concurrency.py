@@ -0,0 +1,205 @@
+import asyncio
+import math
+from collections import deque
+
+from payman.core.deadline import remaining
+from payman.core.exceptions.base import ConcurrencyLimitExceededError
+
+
+class AIMDLimit:
+    """
+    Additive-increase/multiplicative-decrease limit.
+
+    The limit grows by one for each successful call made while the limit is
+    in use and is multiplied by `backoff_ratio` when a call fails (timeout,
+    connection error, 429/503) or is slower than `timeout`.
+
+    Args:
+        backoff_ratio: Factor applied to the limit on a failure.
+        timeout: Latency in seconds treated as a failure; None disables it.
+    """
+
+    def __init__(self, backoff_ratio: float = 0.9, timeout: float | None = None):
+        self.backoff_ratio = backoff_ratio
+        self.timeout = timeout
+
+    def update(self, limit: float, rtt: float, in_flight: int, dropped: bool) -> float:
+        if dropped or (self.timeout is not None and rtt > self.timeout):
+            return limit * self.backoff_ratio
+        # Only grow while the current limit is actually being used
+        if in_flight * 2 >= limit:
+            return limit + 1.0
+        return limit
+
+
+class GradientLimit:
+    """
+    Latency-gradient limit.
+
+    Compares a short-term average latency with a slow long-term baseline: as
+    long as they match the limit grows by a queue allowance of ``sqrt(limit)``,
+    and when short-term latency rises above the baseline (the gateway starts
+    queueing) the limit shrinks in proportion. Failures back off like AIMD.
+
+    Args:
+        smoothing: Weight of each new limit estimate.
+        short_window: Samples averaged for the short-term latency.
+        long_window: Samples averaged for the long-term baseline.
+        tolerance: Short/long latency ratio tolerated before shrinking.
+        backoff_ratio: Factor applied to the limit on a failure.
+    """
+
+    def __init__(
+        self,
+        smoothing: float = 0.2,
+        short_window: int = 10,
+        long_window: int = 600,
+        tolerance: float = 1.5,
+        backoff_ratio: float = 0.9,
+    ):
+        self.smoothing = smoothing
+        self.short_window = short_window
+        self.long_window = long_window
+        self.tolerance = tolerance
+        self.backoff_ratio = backoff_ratio
+        self.short_rtt: float | None = None
+        self.long_rtt: float | None = None
+
+    def update(self, limit: float, rtt: float, in_flight: int, dropped: bool) -> float:
+        if dropped:
+            return limit * self.backoff_ratio
+
+        rtt = max(rtt, 1e-6)
+        if self.short_rtt is None:
+            self.short_rtt = self.long_rtt = rtt
+        else:
+            self.short_rtt += (rtt - self.short_rtt) * 2 / (self.short_window + 1)
+            self.long_rtt += (rtt - self.long_rtt) * 2 / (self.long_window + 1)
+
+        # Let the baseline recover quickly once latency drops
+        if self.long_rtt / self.short_rtt > 2:
+            self.long_rtt *= 0.95
+
+        # Do not grow a limit that is not being used
+        if in_flight < limit / 2:
+            return limit
+
+        gradient = max(0.5, min(1.0, self.tolerance * self.long_rtt / self.short_rtt))
+        estimate = limit * gradient + math.sqrt(limit)
+        return limit * (1 - self.smoothing) + estimate * self.smoothing
+
+
+class ConcurrencyLimiter:
+    """
+    Caps in-flight requests with a limit that adapts to gateway latency and errors.
+
+    Each request holds a slot while it is on the wire and reports its latency
+    and outcome when it finishes; `algorithm` turns those samples into a new
+    limit between `min_limit` and `max_limit`. Requests beyond the limit wait
+    in FIFO order, up to `max_queue` of them for at most `max_wait` seconds,
+    and are otherwise shed with `ConcurrencyLimitExceededError`. Share one
+    instance between clients that talk to the same gateway.
+
+    Args:
+        algorithm: `AIMDLimit` (default) or `GradientLimit`.
+        initial_limit: Starting limit.
+        min_limit: Lower bound of the limit.
+        max_limit: Upper bound of the limit.
+        max_queue: Requests allowed to wait for a slot; 0 sheds immediately.
+        max_wait: Longest time a request waits for a slot; None waits indefinitely.
+    """
+
+    def __init__(
+        self,
+        algorithm: AIMDLimit | GradientLimit | None = None,
+        initial_limit: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        max_queue: int = 100,
+        max_wait: float | None = 5.0,
+    ):
+        self.algorithm = algorithm or AIMDLimit()
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.limit = float(initial_limit)
+        self.in_flight = 0
+        self.shed = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    def __repr__(self) -> str:
+        return (
+            f"<ConcurrencyLimiter limit={int(self.limit)} in_flight={self.in_flight}"
+            f" queued={len(self._waiters)}>"
+        )
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        """
+        Take a slot, waiting for one if the limit is reached.
+
+        Raises:
+            ConcurrencyLimitExceededError: If the queue is full or the wait outlasts
+                `max_wait` or the current deadline.
+        """
+
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.shed += 1
+            raise ConcurrencyLimitExceededError(int(self.limit), len(self._waiters))
+
+        max_wait = self.max_wait
+        left = remaining()
+        if left is not None:
+            # Do not queue past the caller's deadline
+            max_wait = max(0.0, left if max_wait is None else min(max_wait, left))
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), max_wait)
+        except asyncio.TimeoutError:
+            self._abandon(waiter)
+            self.shed += 1
+            raise ConcurrencyLimitExceededError(int(self.limit), len(self._waiters)) from None
+        except BaseException:
+            self._abandon(waiter)
+            raise
+
+    def _abandon(self, waiter: asyncio.Future) -> None:
+        if waiter.done() and not waiter.cancelled():
+            # The slot was handed over just as the wait ended
+            self.release(None)
+        else:
+            waiter.cancel()
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+
+    def release(self, rtt: float | None, dropped: bool = False) -> None:
+        """
+        Return a slot and feed the call's outcome into the limit.
+
+        Args:
+            rtt: Seconds the call took, or None if it did not complete
+                (e.g. cancelled) and should not be sampled.
+            dropped: Whether the call failed in a way that signals overload.
+        """
+
+        if rtt is not None:
+            limit = self.algorithm.update(self.limit, rtt, self.in_flight, dropped)
+            self.limit = min(float(self.max_limit), max(float(self.min_limit), limit))
+        self.in_flight -= 1
+
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
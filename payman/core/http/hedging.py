@@ -0,0 +1,72 @@
+from collections import deque
+
+from .retry import RetryBudget
+
+
+class HedgePolicy:
+    """
+    Decides when an idempotent request gets a second, hedged copy.
+
+    If the first attempt has not answered within the hedge delay, an identical
+    request is sent; whichever answers first wins and the other is cancelled.
+    The delay is either fixed or the rolling `percentile` of recent latencies of
+    the endpoint, and a token-bucket budget caps hedges to a fraction of traffic.
+
+    Args:
+        endpoints: Path suffixes of the idempotent endpoints that may be hedged.
+        delay: Fixed hedge delay in seconds. None uses the rolling percentile.
+        percentile: Latency percentile used as the delay, e.g. 0.95.
+        min_delay: Lower bound for the percentile-based delay.
+        window_size: Number of recent latencies kept per endpoint.
+        min_samples: Latencies required before percentile-based hedging starts.
+        budget: Budget for hedges; defaults to 10% of the hedgeable traffic.
+    """
+
+    def __init__(
+        self,
+        endpoints: tuple[str, ...] = ("/verify", "/inquiry"),
+        delay: float | None = None,
+        percentile: float = 0.95,
+        min_delay: float = 0.05,
+        window_size: int = 200,
+        min_samples: int = 20,
+        budget: RetryBudget | None = None,
+    ):
+        self.endpoints = tuple(endpoint.rstrip("/") for endpoint in endpoints)
+        self.delay = delay
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.window_size = window_size
+        self.min_samples = min_samples
+        self.budget = budget or RetryBudget(ratio=0.1, capacity=5.0)
+        self.hedged = 0
+        self._latencies: dict[str, deque[float]] = {}
+        self._delays: dict[str, float] = {}
+        self._observed = 0
+
+    def handles(self, url: str) -> bool:
+        return url.partition("?")[0].rstrip("/").endswith(self.endpoints)
+
+    def delay_for(self, url: str) -> float | None:
+        """Return the hedge delay for `url`, or None if it should not be hedged yet."""
+
+        if self.delay is not None:
+            return self.delay
+        return self._delays.get(url.partition("?")[0])
+
+    def observe(self, url: str, duration: float) -> None:
+        """Record the latency of a successful request."""
+
+        key = url.partition("?")[0]
+        samples = self._latencies.get(key)
+        if samples is None:
+            samples = self._latencies[key] = deque(maxlen=self.window_size)
+        samples.append(duration)
+        self._observed += 1
+        if len(samples) < self.min_samples:
+            return
+        # Refresh the percentile every few samples rather than on every call
+        if key not in self._delays or self._observed % 8 == 0:
+            ordered = sorted(samples)
+            index = min(len(ordered) - 1, int(self.percentile * len(ordered)))
+            self._delays[key] = max(self.min_delay, ordered[index])
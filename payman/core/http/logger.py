@@ -10,25 +10,31 @@ class LoggerMixin:
     def log_request(
         self, method: str, url: str, json_data: dict | None = None, debug: bool = True
     ):
-        self.logger.info(f"HTTP {method.upper()} {url}")
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(f"HTTP {method.upper()} {url}")
         if json_data and debug and self.logger.isEnabledFor(logging.DEBUG):
             body = str(json_data)
             if len(body) > self.max_body_length:
                 body = f"{body[:self.max_body_length]}... [truncated]"
             self.logger.debug(f"Request Body: {body}")
 
-    def log_response(self, method: str, url: str, response_text: str, duration: float):
+    def log_response(
+        self, method: str, url: str, response_body: str | bytes, duration: float
+    ):
         if duration > 3.0:  # slow request threshold
             self.logger.warning(
                 f"Slow request: {method.upper()} {url} took {duration:.2f}s"
             )
-        else:
+        elif self.logger.isEnabledFor(logging.INFO):
             self.logger.info(
                 f"Request completed: {method.upper()} {url} took {duration:.2f}s"
             )
 
         if self.logger.isEnabledFor(logging.DEBUG):
-            body = response_text
+            # Only decode the body when it will actually be emitted
+            body = response_body
+            if isinstance(body, bytes):
+                body = body.decode("utf-8", errors="replace")
             if len(body) > self.max_body_length:
                 body = f"{body[:self.max_body_length]}... [truncated]"
             self.logger.debug(f"Response Body: {body}")
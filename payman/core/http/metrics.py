@@ -0,0 +1,212 @@
+from bisect import bisect_left
+from urllib.parse import urlsplit
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestEvent:
+    """
+    Lifecycle event of a single request attempt passed to `MetricsHook` callbacks.
+
+    The same object is passed to `on_request_start` and then to either
+    `on_request_end` or `on_request_error`, filled in with the outcome.
+
+    Attributes:
+        gateway: Upstream host, e.g. ``gateway.zibal.ir``.
+        endpoint: Request path, e.g. ``/v1/verify``.
+        method: HTTP method.
+        attempt: 0 for the first attempt, 1 for the first retry and so on.
+        status: HTTP status code, if a response was received.
+        duration: Seconds spent on the attempt, once finished.
+        error: Exception raised by the attempt, if any.
+        timings: Per-phase timings when the client runs with ``trace_timings=True``.
+        headers: Extra request headers; hooks may fill this in `on_request_start`,
+            e.g. to propagate a tracing span.
+    """
+
+    __slots__ = (
+        "gateway", "endpoint", "method", "attempt", "status", "duration", "error", "timings", "headers"
+    )
+
+    def __init__(self, method: str, url: str, attempt: int = 0):
+        parts = urlsplit(url)
+        self.gateway = parts.netloc
+        self.endpoint = parts.path or "/"
+        self.method = method.upper()
+        self.attempt = attempt
+        self.status: int | None = None
+        self.duration: float | None = None
+        self.error: Exception | None = None
+        self.timings: dict[str, float] | None = None
+        self.headers: dict[str, str] = {}
+
+
+class MetricsHook:
+    """Receives request lifecycle events from `AsyncHttpClient`. Override what you need."""
+
+    def on_request_start(self, event: RequestEvent) -> None: ...
+
+    def on_request_end(self, event: RequestEvent) -> None: ...
+
+    def on_request_error(self, event: RequestEvent) -> None: ...
+
+
+class Counter:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram.
+
+    Args:
+        buckets: Sorted upper bounds in seconds; an implicit ``+Inf`` bucket is added.
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate the `q` quantile by linear interpolation inside its bucket."""
+
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for upper, count in zip(self.buckets, self.counts):
+            if count and seen + count >= rank:
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+            lower = upper
+        return self.buckets[-1] if self.buckets else 0.0
+
+
+def _labels(names: tuple[str, ...], values: tuple) -> str:
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{value}"')
+    return ",".join(pairs)
+
+
+class MetricsRegistry(MetricsHook):
+    """
+    Built-in metrics hook collecting per-gateway and per-endpoint counters and
+    latency histograms, exportable in Prometheus text format.
+
+    Share one instance across gateway instances and expose `render_prometheus`
+    on your metrics endpoint.
+
+    Args:
+        buckets: Latency histogram bucket bounds in seconds.
+        prefix: Metric name prefix.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS, prefix: str = "payman"):
+        self.buckets = buckets
+        self.prefix = prefix
+        self.requests: dict[tuple, Counter] = {}
+        self.errors: dict[tuple, Counter] = {}
+        self.retries: dict[tuple, Counter] = {}
+        self.latency: dict[tuple, Histogram] = {}
+        self.phases: dict[tuple, Histogram] = {}
+
+    def on_request_start(self, event: RequestEvent) -> None:
+        if event.attempt:
+            key = (event.gateway, event.endpoint, event.method)
+            counter = self.retries.get(key)
+            if counter is None:
+                counter = self.retries[key] = Counter()
+            counter.inc()
+
+    def on_request_end(self, event: RequestEvent) -> None:
+        self._record(event)
+
+    def on_request_error(self, event: RequestEvent) -> None:
+        self._record(event)
+        key = (event.gateway, event.endpoint, event.method, type(event.error).__name__)
+        counter = self.errors.get(key)
+        if counter is None:
+            counter = self.errors[key] = Counter()
+        counter.inc()
+
+    def _record(self, event: RequestEvent) -> None:
+        key = (event.gateway, event.endpoint, event.method, event.status or "")
+        counter = self.requests.get(key)
+        if counter is None:
+            counter = self.requests[key] = Counter()
+        counter.inc()
+
+        if event.duration is not None:
+            key = (event.gateway, event.endpoint, event.method)
+            histogram = self.latency.get(key)
+            if histogram is None:
+                histogram = self.latency[key] = Histogram(self.buckets)
+            histogram.observe(event.duration)
+
+        if event.timings:
+            for phase, seconds in event.timings.items():
+                key = (event.gateway, event.endpoint, event.method, phase)
+                histogram = self.phases.get(key)
+                if histogram is None:
+                    histogram = self.phases[key] = Histogram(self.buckets)
+                histogram.observe(seconds)
+
+    def histogram(self, gateway: str, endpoint: str, method: str = "POST") -> Histogram | None:
+        return self.latency.get((gateway, endpoint, method.upper()))
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+
+        prefix = self.prefix
+        route = ("gateway", "endpoint", "method")
+        lines = []
+
+        def counters(name: str, help_text: str, series: dict, names: tuple[str, ...]) -> None:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for key, counter in series.items():
+                lines.append(f"{prefix}_{name}{{{_labels(names, key)}}} {counter.value}")
+
+        counters("requests_total", "Outbound gateway request attempts.", self.requests, route + ("status",))
+        counters("request_errors_total", "Failed gateway request attempts.", self.errors, route + ("error",))
+        counters("request_retries_total", "Retried gateway request attempts.", self.retries, route)
+
+        def histograms(name: str, help_text: str, series: dict, names: tuple[str, ...]) -> None:
+            name = f"{prefix}_{name}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, histogram in series.items():
+                labels = _labels(names, key)
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+                lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+        histograms("request_duration_seconds", "Gateway request attempt latency.", self.latency, route)
+        if self.phases:
+            histograms(
+                "request_phase_seconds", "Gateway request latency per phase.", self.phases, route + ("phase",)
+            )
+
+        return "\n".join(lines) + "\n"
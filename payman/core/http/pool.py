@@ -0,0 +1,134 @@
+import asyncio
+import threading
+import weakref
+from typing import AsyncGenerator, Callable, Hashable
+from urllib.parse import urlsplit
+
+import httpx
+
+
+def origin_of(url: str) -> str:
+    """Return the ``scheme://host[:port]`` part of a URL."""
+
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class _LoopClients:
+    """Clients opened on one event loop, plus the watcher that closes them with it."""
+
+    __slots__ = ("clients", "watcher")
+
+    def __init__(self):
+        self.clients: dict[Hashable, httpx.AsyncClient] = {}
+        self.watcher: AsyncGenerator | None = None
+
+
+class ClientPool:
+    """
+    Registry of pooled ``httpx.AsyncClient`` instances, one set per event loop.
+
+    Clients are keyed by upstream origin and client settings, so every gateway
+    instance talking to the same host with the same settings borrows keep-alive
+    connections from one pool instead of opening its own. httpx connections
+    cannot outlive the loop they were opened on, so each running loop (e.g.
+    one per thread) gets its own clients, and one gateway instance can be used
+    from any of them.
+
+    Lookups on the hot path are a plain dictionary read without locking. When
+    a loop is shut down by ``asyncio.run`` (or anything else calling
+    ``loop.shutdown_asyncgens()``), its clients are closed on that loop.
+    """
+
+    def __init__(self):
+        self._loops: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopClients]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        origin: str,
+        settings: Hashable,
+        factory: Callable[[], httpx.AsyncClient],
+    ) -> httpx.AsyncClient:
+        """
+        Return the pooled client for `origin` and `settings` on the running
+        loop, creating it on first use.
+
+        Args:
+            origin: Upstream origin, e.g. ``https://gateway.zibal.ir``.
+            settings: Hashable description of the client settings.
+            factory: Callable building a new client when none is pooled yet.
+        """
+
+        loop = asyncio.get_running_loop()
+        entry = self._loops.get(loop)
+        if entry is None:
+            entry = self._register(loop)
+
+        key = (origin, settings)
+        client = entry.clients.get(key)
+        if client is None or client.is_closed:
+            # No await between the lookup and the store, so the loop cannot
+            # interleave another creation for the same key
+            client = entry.clients[key] = factory()
+        return client
+
+    def _register(self, loop: asyncio.AbstractEventLoop) -> _LoopClients:
+        with self._lock:
+            entry = self._loops.get(loop)
+            if entry is not None:
+                return entry
+            # Forget loops that were closed without shutting down async generators
+            for closed in [other for other in self._loops if other.is_closed()]:
+                del self._loops[closed]
+
+            entry = self._loops[loop] = _LoopClients()
+            entry.watcher = self._watch(loop, entry)
+            # Run the watcher up to its `yield` right away; this registers it
+            # with the running loop, whose shutdown_asyncgens() will finalize it
+            try:
+                entry.watcher.asend(None).send(None)
+            except StopIteration:
+                pass
+            return entry
+
+    async def _watch(self, loop: asyncio.AbstractEventLoop, entry: _LoopClients) -> AsyncGenerator:
+        try:
+            yield
+        finally:
+            with self._lock:
+                if self._loops.get(loop) is entry:
+                    del self._loops[loop]
+            clients = list(entry.clients.values())
+            entry.clients.clear()
+            for client in clients:
+                await client.aclose()
+
+    def __len__(self) -> int:
+        return sum(len(entry.clients) for entry in list(self._loops.values()))
+
+    async def aclose(self) -> None:
+        """
+        Close every pooled client opened on the running event loop.
+
+        Clients of other running loops are left to those loops; clients of
+        loops that are already closed are dropped from the registry.
+        """
+
+        entry = self._loops.get(asyncio.get_running_loop())
+        if entry is not None:
+            await entry.watcher.aclose()
+        with self._lock:
+            for closed in [other for other in self._loops if other.is_closed()]:
+                del self._loops[closed]
+
+
+shared_pool = ClientPool()
+
+
+async def close_shared_clients() -> None:
+    """Close the shared connection pools of the running loop. Call this at application shutdown."""
+
+    await shared_pool.aclose()
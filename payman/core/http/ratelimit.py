@@ -0,0 +1,218 @@
+import asyncio
+import time
+
+from payman.core.deadline import remaining
+from payman.core.exceptions.base import RateLimitExceededError
+
+from ...interfaces.shared_state import SharedStateBackend
+from .metrics import Histogram
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at `rate` tokens per second, holding at most `burst`.
+
+    Tokens are reserved ahead of time: a caller that finds the bucket empty
+    takes a future token and learns how long to wait for it, so waiters are
+    served in arrival order without a background task.
+
+    Args:
+        rate: Tokens added per second.
+        burst: Bucket capacity, i.e. the largest burst allowed after idling.
+    """
+
+    __slots__ = ("rate", "burst", "tokens", "updated_at")
+
+    def __init__(self, rate: float, burst: float | None = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.tokens = self.burst
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def _reserve(self, now: float, max_wait: float | None) -> float | None:
+        self._refill(now)
+        wait = max(0.0, (1.0 - self.tokens) / self.rate)
+        if max_wait is not None and wait > max_wait:
+            return None
+        self.tokens -= 1.0
+        return wait
+
+    def _refund(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + 1.0)
+
+    def _pause(self, now: float, seconds: float) -> None:
+        self._refill(now)
+        self.tokens = min(self.tokens, -seconds * self.rate + 1.0)
+
+    def reserve(self, max_wait: float | None = None) -> float | None:
+        """
+        Take one token and return the seconds to wait before using it, or None
+        (taking nothing) if that wait would exceed `max_wait`.
+        """
+
+        return self._reserve(time.monotonic(), max_wait)
+
+    def refund(self) -> None:
+        self._refund(time.monotonic())
+
+    def pause(self, seconds: float) -> None:
+        """Empty the bucket so the next token becomes available in `seconds`."""
+
+        self._pause(time.monotonic(), seconds)
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    `TokenBucket` whose state lives in a `SharedStateBackend`, so every
+    process using the backend draws from one bucket. Uses wall-clock time,
+    which unlike `time.monotonic` is comparable between processes.
+
+    Args:
+        backend: Shared state storage.
+        key: Key of the bucket in `backend`.
+        rate: Tokens added per second.
+        burst: Bucket capacity.
+    """
+
+    __slots__ = ("backend", "key")
+
+    def __init__(
+        self, backend: SharedStateBackend, key: str, rate: float, burst: float | None = None
+    ):
+        super().__init__(rate, burst)
+        self.backend = backend
+        self.key = key
+
+    def _shared(self, operation, *args):
+        def update(state: dict | None):
+            now = time.time()
+            if state is None:
+                self.tokens, self.updated_at = self.burst, now
+            else:
+                self.tokens, self.updated_at = state["tokens"], state["updated_at"]
+            result = operation(now, *args)
+            return {"tokens": self.tokens, "updated_at": self.updated_at}, result
+
+        return self.backend.transact(self.key, update)
+
+    def reserve(self, max_wait: float | None = None) -> float | None:
+        return self._shared(self._reserve, max_wait)
+
+    def refund(self) -> None:
+        self._shared(self._refund)
+
+    def pause(self, seconds: float) -> None:
+        self._shared(self._pause, seconds)
+
+
+class RateLimiter:
+    """
+    Client-side rate limits for outbound gateway calls.
+
+    Each limit key gets its own `TokenBucket`. The key is the client's
+    `rate_limit_key` (e.g. ``"zibal:<merchant_id>"``, defaulting to the
+    upstream host) plus, with `per_endpoint`, the request path. Requests wait
+    for a token for up to `max_wait` seconds and otherwise fail fast with
+    `RateLimitExceededError`, without being sent. A 429 response pauses the
+    bucket for the server's ``Retry-After``. Share one instance between the
+    gateway instances that draw on the same quota.
+
+    Args:
+        rate: Requests per second allowed per key.
+        burst: Bucket capacity; defaults to one second worth of requests.
+        max_wait: Longest time a request may queue for a token. None waits
+            indefinitely, 0 never waits.
+        per_endpoint: Give every endpoint its own bucket.
+        endpoint_rates: Per-endpoint rates by path suffix (e.g. ``{"/verify": 20}``),
+            overriding `rate`; implies separate buckets for those endpoints.
+        shared_state: Keep the buckets in a `SharedStateBackend`, e.g. a
+            `SQLiteStateBackend`, so all worker processes on the host enforce
+            one combined rate.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float | None = None,
+        max_wait: float | None = 1.0,
+        per_endpoint: bool = False,
+        endpoint_rates: dict[str, float] | None = None,
+        shared_state: SharedStateBackend | None = None,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self.per_endpoint = per_endpoint
+        self.endpoint_rates = {
+            suffix.rstrip("/"): endpoint_rate
+            for suffix, endpoint_rate in (endpoint_rates or {}).items()
+        }
+        self.shared_state = shared_state
+        self.acquired = 0
+        self.rejected = 0
+        self.queued_time = Histogram()
+        self._buckets: dict[tuple[str, str], TokenBucket] = {}
+
+    def bucket(self, key: str, path: str = "") -> TokenBucket:
+        """Return the bucket for limit key `key` and request path `path`."""
+
+        path = path.rstrip("/")
+        rate = self.rate
+        endpoint = ""
+        for suffix, endpoint_rate in self.endpoint_rates.items():
+            if path.endswith(suffix):
+                rate, endpoint = endpoint_rate, suffix
+                break
+        else:
+            if self.per_endpoint:
+                endpoint = path
+
+        bucket = self._buckets.get((key, endpoint))
+        if bucket is None:
+            burst = self.burst if endpoint not in self.endpoint_rates else None
+            if self.shared_state is not None:
+                bucket = SharedTokenBucket(self.shared_state, f"ratelimit:{key}:{endpoint}", rate, burst)
+            else:
+                bucket = TokenBucket(rate, burst)
+            self._buckets[(key, endpoint)] = bucket
+        return bucket
+
+    async def acquire(self, key: str, path: str = "") -> float:
+        """
+        Wait for a token and return the time spent queued.
+
+        Raises:
+            RateLimitExceededError: If the token is further away than `max_wait`
+                or the current deadline.
+        """
+
+        bucket = self.bucket(key, path)
+        max_wait = self.max_wait
+        left = remaining()
+        if left is not None:
+            # Do not queue past the caller's deadline
+            max_wait = max(0.0, left if max_wait is None else min(max_wait, left))
+        wait = bucket.reserve(max_wait)
+        if wait is None:
+            self.rejected += 1
+            raise RateLimitExceededError(f"{key}{path}", (1.0 - bucket.tokens) / bucket.rate)
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except BaseException:
+                bucket.refund()
+                raise
+        self.acquired += 1
+        self.queued_time.observe(wait)
+        return wait
+
+    def throttled(self, key: str, path: str, retry_after: float) -> None:
+        """Pause the bucket after the server signalled throttling (HTTP 429)."""
+
+        self.bucket(key, path).pause(retry_after)
@@ -0,0 +1,166 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from payman.core.exceptions.http import (
+    HttpClientError,
+    HttpStatusError,
+    InvalidJsonError
+)
+
+from ...interfaces.shared_state import SharedStateBackend
+
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse a ``Retry-After`` header value into seconds.
+
+    Accepts both the delay-seconds and the HTTP-date forms. Returns None for
+    missing or malformed values.
+    """
+
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class RetryPolicy:
+    """
+    Decides whether a failed request is retried and how long to wait before it.
+
+    The default policy retries transport errors, timeouts and the statuses in
+    `retry_statuses`, backing off exponentially with full jitter and honoring
+    ``Retry-After`` headers. Subclass and override `is_retryable` or
+    `get_delay` to plug in a different strategy.
+
+    Args:
+        max_retries: Maximum retry attempts after the first request.
+        base_delay: Backoff base in seconds; attempt ``n`` waits up to ``base_delay * 2**n``.
+        max_delay: Upper bound for a single backoff, including ``Retry-After``.
+        retry_statuses: HTTP status codes considered transient.
+        respect_retry_after: Wait as long as the server's ``Retry-After`` asks.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 0,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        retry_statuses: frozenset[int] = RETRYABLE_STATUSES,
+        respect_retry_after: bool = True,
+    ):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = retry_statuses
+        self.respect_retry_after = respect_retry_after
+
+    def is_retryable(self, exc: HttpClientError) -> bool:
+        if isinstance(exc, HttpStatusError):
+            return exc.status_code in self.retry_statuses
+        return not isinstance(exc, InvalidJsonError)
+
+    def get_delay(self, attempt: int, exc: HttpClientError) -> float:
+        """Return the delay in seconds before retry number `attempt` (0-based)."""
+
+        if self.respect_retry_after and isinstance(exc, HttpStatusError):
+            retry_after = parse_retry_after(exc.headers.get("retry-after"))
+            if retry_after is not None:
+                return min(retry_after, self.max_delay)
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+
+class RetryBudget:
+    """
+    Token bucket limiting retries to a fraction of the traffic it sees.
+
+    Every request deposits `ratio` tokens and every retry spends one, so over
+    time retries cannot exceed ``ratio`` times the number of requests. The
+    bucket starts full, allowing a burst of `capacity` retries at low traffic.
+
+    Args:
+        ratio: Fraction of requests that may be retried.
+        capacity: Maximum number of stored tokens.
+    """
+
+    def __init__(self, ratio: float = 0.2, capacity: float = 10.0):
+        self.ratio = ratio
+        self.capacity = capacity
+        self.tokens = capacity
+
+    def deposit(self) -> None:
+        self.tokens = min(self.capacity, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        return True
+
+
+_shared_budgets: dict[str, RetryBudget] = {}
+_shared_budgets_lock = threading.Lock()
+
+
+def shared_retry_budget(origin: str) -> RetryBudget:
+    """
+    Return the process-wide default retry budget of an upstream origin.
+
+    Clients without an explicit `retry_budget` draw on this one, so gateway
+    instances created per request still share the budget of their host.
+    """
+
+    budget = _shared_budgets.get(origin)
+    if budget is None:
+        with _shared_budgets_lock:
+            budget = _shared_budgets.setdefault(origin, RetryBudget())
+    return budget
+
+
+class SharedRetryBudget(RetryBudget):
+    """
+    `RetryBudget` whose tokens live in a `SharedStateBackend`, so retries are
+    capped across all worker processes on the host rather than per process.
+
+    Args:
+        backend: Shared state storage.
+        key: Key of the budget in `backend`; clients sharing a key share a budget.
+        ratio: Fraction of requests that may be retried.
+        capacity: Maximum number of stored tokens.
+    """
+
+    def __init__(
+        self,
+        backend: SharedStateBackend,
+        key: str = "retry_budget",
+        ratio: float = 0.2,
+        capacity: float = 10.0,
+    ):
+        super().__init__(ratio, capacity)
+        self.backend = backend
+        self.key = key
+
+    def _shared(self, operation):
+        def update(state: dict | None):
+            self.tokens = self.capacity if state is None else state["tokens"]
+            result = operation()
+            return {"tokens": self.tokens}, result
+
+        return self.backend.transact(self.key, update)
+
+    def deposit(self) -> None:
+        self._shared(super().deposit)
+
+    def withdraw(self) -> bool:
+        return self._shared(super().withdraw)
@@ -0,0 +1,141 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, TypeVar
+
+from ...interfaces.shared_state import SharedStateBackend
+
+Result = TypeVar("Result")
+
+# Seconds to wait for concurrent workers while opening the database at startup
+SETUP_TIMEOUT = 5.0
+
+
+class MemoryStateBackend(SharedStateBackend):
+    """
+    Shared state kept in this process only; shared between the clients and
+    threads of one worker.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: dict[str, dict] = {}
+
+    def transact(
+        self, key: str, update: Callable[[dict | None], tuple[dict | None, Result]]
+    ) -> Result:
+        with self._lock:
+            value, result = update(self._values.get(key))
+            if value is None:
+                self._values.pop(key, None)
+            else:
+                self._values[key] = value
+            return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class SQLiteStateBackend(SharedStateBackend):
+    """
+    Shared state stored in a local SQLite database in WAL mode.
+
+    Every worker process on the host that opens the same file shares one set
+    of rate limit buckets, retry budgets and circuit states; updates run in
+    ``BEGIN IMMEDIATE`` transactions, so they are atomic across processes.
+    Updates that leave the state unchanged (e.g. admitting a call through a
+    closed circuit) only read, which in WAL mode never waits for writers.
+    Transactions run on the calling thread, i.e. the event loop, so waiting
+    for another process's write lock is capped at `busy_timeout`.
+    The connection is reopened after a fork, so an instance created before
+    gunicorn forks its workers is safe to use in each of them. Keep the file
+    on a local disk, e.g. under ``/dev/shm`` or ``/tmp``.
+
+    Args:
+        path: Database file path.
+        busy_timeout: Seconds to wait for another process's write lock before
+            `transact` raises ``sqlite3.OperationalError``.
+    """
+
+    def __init__(self, path: str, busy_timeout: float = 0.1):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._pid = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout * 1000)}")
+            # Losing the last updates on power loss is fine for throttling state
+            conn.execute("PRAGMA synchronous=OFF")
+            give_up_at = time.monotonic() + max(self.busy_timeout, SETUP_TIMEOUT)
+            while True:
+                try:
+                    # Switching to WAL does not wait on the busy handler when
+                    # several workers open a new file at once, so retry here
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS payman_shared_state "
+                        "(key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+                    )
+                    break
+                except sqlite3.OperationalError:
+                    if time.monotonic() >= give_up_at:
+                        conn.close()
+                        raise
+                    time.sleep(0.01)
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def transact(
+        self, key: str, update: Callable[[dict | None], tuple[dict | None, Result]]
+    ) -> Result:
+        with self._lock:
+            conn = self._connection()
+            # Try without the write lock first: most updates change nothing
+            conn.execute("BEGIN")
+            try:
+                row = conn.execute(
+                    "SELECT value FROM payman_shared_state WHERE key = ?", (key,)
+                ).fetchone()
+                stored = row[0] if row else None
+                value, result = update(None if stored is None else json.loads(stored))
+            finally:
+                conn.execute("COMMIT")
+            if (None if value is None else json.dumps(value)) == stored:
+                return result
+
+            # `update` is a pure function of the stored state, so it can run again
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT value FROM payman_shared_state WHERE key = ?", (key,)
+                ).fetchone()
+                value, result = update(json.loads(row[0]) if row else None)
+                if value is None:
+                    conn.execute("DELETE FROM payman_shared_state WHERE key = ?", (key,))
+                else:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO payman_shared_state (key, value) VALUES (?, ?)",
+                        (key, json.dumps(value)),
+                    )
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection().execute("DELETE FROM payman_shared_state")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
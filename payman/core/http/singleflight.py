@@ -0,0 +1,62 @@
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Hashable
+
+
+def request_key(method: str, url: str, json_data: Any = None, **kwargs) -> tuple:
+    """
+    Build a canonical key identifying an outgoing request.
+
+    The JSON body and remaining request options are serialized with sorted keys,
+    so logically identical requests map to the same key.
+    """
+
+    body = json.dumps(json_data, sort_keys=True, separators=(",", ":"), default=str)
+    options = json.dumps(kwargs, sort_keys=True, separators=(",", ":"), default=str) if kwargs else ""
+    return method.upper(), url, body, options
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls into one upstream request.
+
+    While a call for a key is in flight, further calls with the same key wait
+    for it and receive the same result or exception. Share one instance across
+    gateway instances to coalesce duplicates coming from different requests
+    (e.g. double-clicked pay buttons or repeated callback redirects). Shared
+    results are the same object for every caller and must be treated as
+    read-only.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.shared = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run `func` unless a call with the same `key` is already in flight.
+
+        The upstream call runs in its own task, so cancelling one waiter does not
+        cancel it for the others.
+        """
+
+        task = self._calls.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            self.shared += 1
+        else:
+            self.calls += 1
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every waiter went away
+            task.exception()
@@ -0,0 +1,67 @@
+import time
+
+# httpcore trace operation -> reported phase
+PHASES = {
+    "connect_tcp": "connect",
+    "connect_unix_socket": "connect",
+    "start_tls": "tls",
+    "send_connection_init": "send",
+    "send_request_headers": "send",
+    "send_request_body": "send",
+    "receive_response_headers": "ttfb",
+    "receive_response_body": "body",
+}
+
+
+class PhaseTimer:
+    """
+    httpx ``trace`` extension recording how long each phase of a request took.
+
+    Phases, in seconds:
+        queue_wait: Waiting for the client's rate and concurrency limiters,
+            reported only when a limiter is configured.
+        pool_wait: Until the request got a connection from the pool.
+        connect: Opening the TCP connection, including DNS resolution.
+        tls: TLS handshake.
+        send: Writing the request headers and body.
+        ttfb: Waiting for the response headers (server processing time).
+        body: Reading the response body.
+        total: The whole request, from the moment it left the limiters.
+
+    Phases that did not happen (e.g. ``connect`` and ``tls`` on a reused
+    keep-alive connection) are absent.
+    """
+
+    __slots__ = ("start", "timings", "_started")
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.timings: dict[str, float] = {}
+        self._started: dict[str, float] = {}
+
+    async def __call__(self, name: str, info: dict) -> None:
+        now = time.perf_counter()
+        if "pool_wait" not in self.timings:
+            self.timings["pool_wait"] = now - self.start
+
+        operation, _, stage = name.partition(".")[2].rpartition(".")
+        phase = PHASES.get(operation)
+        if phase is None:
+            return
+        if stage == "started":
+            self._started[operation] = now
+        elif operation in self._started:
+            elapsed = now - self._started.pop(operation)
+            self.timings[phase] = self.timings.get(phase, 0.0) + elapsed
+
+    def begin(self) -> None:
+        """Mark the request as handed to httpx; the time before counts as ``queue_wait``."""
+
+        now = time.perf_counter()
+        self.timings["queue_wait"] = now - self.start
+        self.start = now
+
+    def finish(self) -> dict[str, float]:
+        self.timings.setdefault("pool_wait", 0.0)
+        self.timings["total"] = time.perf_counter() - self.start
+        return self.timings
@@ -0,0 +1,252 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Iterator, NamedTuple
+
+from payman.core.callbacks import verify_request_from
+from payman.core.gateways.router import get_token
+from payman.core.http.cache import is_terminal_success
+from payman.interfaces.gateway_base import GatewayInterface
+
+INITIATED = "initiated"
+VERIFIED = "verified"
+FAILED = "failed"
+EXPIRED = "expired"
+
+# Events after which a payment needs no further reconciliation
+TERMINAL_EVENTS = (VERIFIED, EXPIRED)
+
+
+def to_json(value: Any) -> Any:
+    """Convert Pydantic models (possibly nested in dicts) to JSON-compatible data."""
+
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if isinstance(value, dict):
+        return {key: to_json(item) for key, item in value.items()}
+    return value
+
+
+def is_verified(response: Any) -> bool:
+    """Whether a verify response confirms the payment (`success` attribute or terminal result code)."""
+
+    if isinstance(response, dict):
+        return is_terminal_success(response)
+    return bool(getattr(response, "success", False))
+
+
+class JournalEntry(NamedTuple):
+    """
+    One event of the payment journal.
+
+    Attributes:
+        seq: Position in the journal; increases with every appended event.
+        gateway: Name of the gateway the payment belongs to.
+        token: Payment token (e.g. Zibal `track_id`).
+        event: "initiated", "verified", "failed" or "expired".
+        created_at: Unix timestamp of the event.
+        data: Event payload, e.g. the initiation request and the verify request.
+    """
+
+    seq: int
+    gateway: str
+    token: str
+    event: str
+    created_at: float
+    data: dict
+
+
+class PaymentJournal:
+    """
+    Append-only local record of payment events, stored in SQLite (WAL mode).
+
+    Events are never updated or deleted: a payment is pending from its
+    "initiated" event until a terminal event ("verified" or "expired") is
+    appended for the same gateway and token. Reconciliation progress is checkpointed in a separate table.
+    Safe to share between threads; every process on the host may use the
+    same file.
+
+    Args:
+        path: Database file path.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS payman_journal ("
+            " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " gateway TEXT NOT NULL,"
+            " token TEXT NOT NULL,"
+            " event TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " data TEXT NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS payman_journal_token"
+            " ON payman_journal (gateway, token, event);"
+            "CREATE TABLE IF NOT EXISTS payman_journal_checkpoints ("
+            " name TEXT PRIMARY KEY, seq INTEGER NOT NULL);"
+        )
+
+    def append(
+        self, gateway: str, token: str | int, event: str, data: dict | None = None
+    ) -> int:
+        """Append an event and return its sequence number."""
+
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO payman_journal (gateway, token, event, created_at, data)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (gateway, str(token), event, time.time(), json.dumps(to_json(data or {}), default=str)),
+            )
+            return cursor.lastrowid
+
+    def history(self, gateway: str, token: str | int) -> list[JournalEntry]:
+        """Return all events of one payment, oldest first."""
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, gateway, token, event, created_at, data FROM payman_journal"
+                " WHERE gateway = ? AND token = ? ORDER BY seq",
+                (gateway, str(token)),
+            ).fetchall()
+        return [self._entry(row) for row in rows]
+
+    def pending(
+        self, after: int = 0, limit: int = 1000, older_than: float = 0.0
+    ) -> list[JournalEntry]:
+        """
+        Return up to `limit` initiations after sequence `after` that have no terminal event.
+
+        Args:
+            after: Only return events with a higher sequence number.
+            limit: Maximum number of entries.
+            older_than: Skip payments initiated less than this many seconds ago.
+        """
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, gateway, token, event, created_at, data FROM payman_journal AS entry"
+                " WHERE seq > ? AND event = ? AND created_at <= ?"
+                " AND NOT EXISTS (SELECT 1 FROM payman_journal AS later"
+                "  WHERE later.gateway = entry.gateway AND later.token = entry.token"
+                "  AND later.event IN (?, ?))"
+                " ORDER BY seq LIMIT ?",
+                (after, INITIATED, time.time() - older_than, *TERMINAL_EVENTS, limit),
+            ).fetchall()
+        return [self._entry(row) for row in rows]
+
+    def iter_pending(
+        self, after: int = 0, chunk_size: int = 1000, older_than: float = 0.0
+    ) -> Iterator[JournalEntry]:
+        """Stream pending initiations after sequence `after`, reading `chunk_size` rows at a time."""
+
+        while True:
+            chunk = self.pending(after, chunk_size, older_than)
+            if not chunk:
+                return
+            yield from chunk
+            after = chunk[-1].seq
+
+    def checkpoint(self, name: str) -> int:
+        """Return the saved position of reconciler `name` (0 if none)."""
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT seq FROM payman_journal_checkpoints WHERE name = ?", (name,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def save_checkpoint(self, name: str, seq: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO payman_journal_checkpoints (name, seq) VALUES (?, ?)",
+                (name, seq),
+            )
+
+    def clear_checkpoint(self, name: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM payman_journal_checkpoints WHERE name = ?", (name,))
+
+    def close(self) -> None:
+        self._conn.close()
+
+    @staticmethod
+    def _entry(row: tuple) -> JournalEntry:
+        seq, gateway, token, event, created_at, data = row
+        return JournalEntry(seq, gateway, token, event, created_at, json.loads(data))
+
+
+class JournaledGateway(GatewayInterface):
+    """
+    Gateway wrapper that records payments in a `PaymentJournal`.
+
+    Every successful `initiate_payment` appends an "initiated" event holding
+    the initiation request and the request needed to verify it later; every
+    successful `verify_payment` appends a "verified" event. Other attributes
+    are delegated to the wrapped gateway.
+
+    Usage:
+        >>> journal = PaymentJournal("payments.db")
+        >>> gateway = JournaledGateway(Payman("zibal", merchant_id="..."), journal, name="zibal")
+        >>> response = await gateway.initiate_payment(amount=10_000, callback_url="...")
+
+    Args:
+        gateway: The gateway to wrap.
+        journal: Journal to write to.
+        name: Gateway name stored with each event; `Reconciler` maps it back
+            to a gateway instance.
+        token_getter: Extracts the payment token from a request or response.
+        is_verified: Decides whether a verify response confirms the payment.
+    """
+
+    def __init__(
+        self,
+        gateway: GatewayInterface,
+        journal: PaymentJournal,
+        name: str = "default",
+        token_getter: Callable[[Any], str | int | None] = get_token,
+        is_verified: Callable[[Any], bool] = is_verified,
+    ):
+        self.gateway = gateway
+        self.journal = journal
+        self.name = name
+        self.token_getter = token_getter
+        self.is_verified = is_verified
+
+    def __repr__(self) -> str:
+        return f"<JournaledGateway {self.name!r} {self.gateway!r}>"
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.gateway, name)
+
+    async def initiate_payment(self, request: Any = None, **kwargs) -> Any:
+        response = await self.gateway.initiate_payment(request, **kwargs)
+        token = self.token_getter(response)
+        if token is not None:
+            payload = to_json(request) if request is not None else {}
+            try:
+                verify_request = verify_request_from(response)
+            except ValueError:
+                verify_request = None
+            self.journal.append(self.name, token, INITIATED, {
+                "request": {**payload, **to_json(kwargs)},
+                "verify": verify_request,
+            })
+        return response
+
+    async def verify_payment(self, request: Any = None, **kwargs) -> Any:
+        response = await self.gateway.verify_payment(request, **kwargs)
+        token = self.token_getter(request) or self.token_getter(kwargs)
+        if token is not None and self.is_verified(response):
+            self.journal.append(self.name, token, VERIFIED, {"response": response})
+        return response
+
+    def get_payment_redirect_url(self, token: str | int) -> str:
+        return self.gateway.get_payment_redirect_url(token)
+
+    async def warmup(self, connections: int = 1) -> int:
+        return await self.gateway.warmup(connections)
@@ -0,0 +1,198 @@
+import logging
+import time
+from typing import Any, AsyncIterator, Callable
+
+from payman.core.batch import BatchResult, bounded_map
+from payman.core.exceptions.base import (
+    CircuitOpenError,
+    ConcurrencyLimitExceededError,
+    RateLimitExceededError,
+)
+from payman.core.exceptions.http import HttpClientError
+from payman.core.journal import (
+    EXPIRED,
+    FAILED,
+    VERIFIED,
+    JournalEntry,
+    PaymentJournal,
+    is_verified,
+)
+from payman.interfaces.gateway_base import GatewayInterface
+
+logger = logging.getLogger(__name__)
+
+# Errors where the gateway never answered (network, timeouts, or the call was
+# shed or throttled locally): the payment may well be paid, so never expire it
+TRANSIENT_ERRORS = (
+    HttpClientError,
+    OSError,
+    CircuitOpenError,
+    RateLimitExceededError,
+    ConcurrencyLimitExceededError,
+)
+
+
+def stored_verify_request(entry: JournalEntry) -> Any:
+    """Return the verify request recorded with an "initiated" journal entry."""
+
+    request = entry.data.get("verify")
+    if request is None:
+        raise ValueError(f"Journal entry {entry.seq} has no verify request; pass a request_factory")
+    return request
+
+
+class Reconciler:
+    """
+    Verifies pending payments recorded in a `PaymentJournal`.
+
+    Pending initiations are streamed from the journal `chunk_size` rows at a
+    time and verified with at most `concurrency` calls in flight, so memory
+    stays constant for arbitrarily large backlogs. Each outcome is appended to
+    the journal: "verified", "failed" (retried on the next run) or "expired"
+    once a payment is older than `expire_after` and the gateway reports it
+    as not verified. Transport errors, timeouts and calls shed by the
+    circuit breaker or limiters are always recorded as "failed".
+
+    Progress is checkpointed every `checkpoint_every` entries as the highest
+    sequence number below which every entry is finished; a run that crashes
+    resumes from there, and a run that completes clears its checkpoint so the
+    next run reconsiders payments that failed.
+
+    Usage:
+        >>> reconciler = Reconciler(journal, {"zibal": Payman("zibal", merchant_id="...")})
+        >>> async for result in reconciler.run():
+        ...     print(result.request.token, result.ok)
+
+    Args:
+        journal: Journal to read and append to.
+        gateways: Gateway instances by the names used in the journal.
+        concurrency: Maximum number of concurrent `verify_payment` calls.
+        chunk_size: Journal rows read per query.
+        older_than: Skip payments initiated less than this many seconds ago,
+            whose users may still be on the payment page.
+        expire_after: Seconds after initiation at which an unverified payment
+            is marked expired. None never expires payments.
+        checkpoint: Name of the checkpoint; use one per independent reconciler.
+        checkpoint_every: Entries finished between checkpoint writes.
+        request_factory: Builds the `verify_payment` request from a journal entry.
+        is_verified: Decides whether a verify response confirms the payment.
+    """
+
+    def __init__(
+        self,
+        journal: PaymentJournal,
+        gateways: dict[str, GatewayInterface],
+        concurrency: int = 10,
+        chunk_size: int = 1000,
+        older_than: float = 900.0,
+        expire_after: float | None = 86400.0,
+        checkpoint: str = "default",
+        checkpoint_every: int = 100,
+        request_factory: Callable[[JournalEntry], Any] = stored_verify_request,
+        is_verified: Callable[[Any], bool] = is_verified,
+    ):
+        self.journal = journal
+        self.gateways = dict(gateways)
+        self.concurrency = concurrency
+        self.chunk_size = chunk_size
+        self.older_than = older_than
+        self.expire_after = expire_after
+        self.checkpoint = checkpoint
+        self.checkpoint_every = checkpoint_every
+        self.request_factory = request_factory
+        self.is_verified = is_verified
+        self.verified = 0
+        self.failed = 0
+        self.expired = 0
+
+    def __repr__(self) -> str:
+        return f"<Reconciler gateways={list(self.gateways)} checkpoint={self.checkpoint!r}>"
+
+    async def _reconcile(self, entry: JournalEntry) -> Any:
+        gateway = self.gateways.get(entry.gateway)
+        if gateway is None:
+            raise LookupError(f"No gateway named '{entry.gateway}' to reconcile with")
+
+        journal = self.journal
+        try:
+            response = await gateway.verify_payment(self.request_factory(entry))
+        except TRANSIENT_ERRORS as exc:
+            self.failed += 1
+            journal.append(entry.gateway, entry.token, FAILED, {"error": repr(exc)})
+            raise
+        except Exception as exc:
+            self._record_unverified(entry, {"error": repr(exc)})
+            raise
+        if self.is_verified(response):
+            self.verified += 1
+            journal.append(entry.gateway, entry.token, VERIFIED, {"response": response})
+        else:
+            self._record_unverified(entry, {"response": response})
+        return response
+
+    def _record_unverified(self, entry: JournalEntry, data: dict) -> None:
+        expire_after = self.expire_after
+        if expire_after is not None and time.time() - entry.created_at >= expire_after:
+            self.expired += 1
+            self.journal.append(entry.gateway, entry.token, EXPIRED, data)
+        else:
+            self.failed += 1
+            self.journal.append(entry.gateway, entry.token, FAILED, data)
+
+    async def run(self, limit: int | None = None) -> AsyncIterator[BatchResult]:
+        """
+        Reconcile pending payments, yielding a `BatchResult` per journal entry
+        in completion order. `BatchResult.request` is the `JournalEntry`.
+
+        Args:
+            limit: Stop after this many entries; the checkpoint is kept so the
+                next run continues where this one stopped.
+        """
+
+        journal = self.journal
+        start = journal.checkpoint(self.checkpoint)
+        if start:
+            logger.info(f"Resuming reconciliation '{self.checkpoint}' after entry {start}")
+
+        def entries():
+            for count, entry in enumerate(
+                journal.iter_pending(start, self.chunk_size, self.older_than)
+            ):
+                if limit is not None and count >= limit:
+                    return
+                yield entry
+
+        # Sequence numbers by input index, until every earlier entry is finished
+        sequences: dict[int, int] = {}
+        finished: set[int] = set()
+        next_index = 0
+        position = start
+        since_checkpoint = 0
+
+        def track(index: int, seq: int) -> None:
+            nonlocal next_index, position, since_checkpoint
+            sequences[index] = seq
+            finished.add(index)
+            while next_index in finished:
+                finished.discard(next_index)
+                position = sequences.pop(next_index)
+                next_index += 1
+                since_checkpoint += 1
+            if since_checkpoint >= self.checkpoint_every:
+                journal.save_checkpoint(self.checkpoint, position)
+                since_checkpoint = 0
+
+        processed = 0
+        stream = bounded_map(self._reconcile, entries(), self.concurrency)
+        try:
+            async for result in stream:
+                processed += 1
+                track(result.index, result.request.seq)
+                yield result
+        finally:
+            await stream.aclose()
+            if position != start:
+                journal.save_checkpoint(self.checkpoint, position)
+
+        if limit is None or processed < limit:
+            journal.clear_checkpoint(self.checkpoint)
@@ -0,0 +1,13 @@
+from typing import Any
+
+
+class CacheBackend:
+    """Protocol for response cache storage backends."""
+
+    def get(self, key: str) -> Any | None: ...
+
+    def set(self, key: str, value: Any, ttl: float) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+    def clear(self) -> None: ...
@@ -0,0 +1,10 @@
+from typing import Any
+
+
+class JsonCodec:
+    """Protocol for JSON codecs used to encode requests and decode responses."""
+
+    def dumps(self, obj: Any) -> bytes: ...
+
+    def loads(self, data: bytes) -> Any:
+        """Decode `data`, raising ValueError if it is not valid JSON."""
@@ -1,8 +1,23 @@
+import asyncio
+import inspect
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Generic,
+    Iterable,
+    TypeVar,
+    get_args,
+    get_type_hints,
+)
 
 from pydantic import BaseModel
 
+from payman.core.batch import BatchResult, bounded_map
+from payman.utils import get_validator
+
+from .http import HttpClientProtocol
+
 Request = TypeVar("Request", bound=BaseModel)
 Response = TypeVar("Response", bound=BaseModel)
 
@@ -25,3 +40,79 @@ class GatewayInterface(ABC, Generic[Request, Response]):
     @abstractmethod
     def get_payment_redirect_url(self, token: str | int) -> str:
         """Return full redirect URL to payment page using the given token."""
+
+    def initiate_many(
+        self,
+        requests: Iterable[Request | dict] | AsyncIterable[Request | dict],
+        concurrency: int = 10,
+    ) -> AsyncIterator[BatchResult]:
+        """
+        Initiate many payments with bounded concurrency.
+
+        Results are streamed in completion order; failures are reported per item.
+        Gateways with a native batch endpoint may override this.
+        """
+
+        return bounded_map(self.initiate_payment, requests, concurrency)
+
+    def verify_many(
+        self,
+        requests: Iterable[Request | dict] | AsyncIterable[Request | dict],
+        concurrency: int = 10,
+    ) -> AsyncIterator[BatchResult]:
+        """
+        Verify many payments with bounded concurrency.
+
+        Results are streamed in completion order; failures are reported per item.
+        Gateways with a native batch endpoint may override this.
+        """
+
+        return bounded_map(self.verify_payment, requests, concurrency)
+
+    def models(self) -> set[type[BaseModel]]:
+        """
+        Return the Pydantic models named in the signatures of this gateway's
+        public methods, e.g. its request and response models.
+        """
+
+        found: set[type[BaseModel]] = set()
+
+        def collect(hint) -> None:
+            if isinstance(hint, type) and issubclass(hint, BaseModel) and hint is not BaseModel:
+                found.add(hint)
+            for arg in get_args(hint):
+                collect(arg)
+
+        for name, member in inspect.getmembers(type(self), inspect.isfunction):
+            if name.startswith("_"):
+                continue
+            try:
+                hints = get_type_hints(member)
+            except Exception:
+                # Unresolvable forward references only cost a missed model
+                continue
+            for hint in hints.values():
+                collect(hint)
+        return found
+
+    async def warmup(self, connections: int = 1) -> int:
+        """
+        Prepare this gateway for traffic.
+
+        Builds the validators of its request/response models and opens
+        `connections` keep-alive connections on each of its HTTP clients, so
+        the first real payment skips schema building, DNS and TLS handshakes.
+
+        Returns:
+            The number of connections opened.
+        """
+
+        for model in self.models():
+            get_validator(model)
+        clients = {
+            id(value): value
+            for value in vars(self).values()
+            if isinstance(value, HttpClientProtocol)
+        }
+        opened = await asyncio.gather(*(client.warmup(connections) for client in clients.values()))
+        return sum(opened)
@@ -11,3 +11,8 @@ class HttpClientProtocol:
         json_data: dict[str, Any] | None = None,
         **kwargs: Any
     ) -> dict[str, Any]: ...
+
+    async def warmup(self, connections: int = 1) -> int:
+        """Open connections ahead of time; returns how many were opened."""
+
+        return 0
@@ -0,0 +1,21 @@
+from typing import Callable, TypeVar
+
+Result = TypeVar("Result")
+
+
+class SharedStateBackend:
+    """
+    Protocol for state shared by every worker process on a host, such as rate
+    limit buckets, retry budgets and circuit breaker health.
+    """
+
+    def transact(
+        self, key: str, update: Callable[[dict | None], tuple[dict | None, Result]]
+    ) -> Result:
+        """
+        Atomically read the JSON-serializable state stored under `key`, pass it
+        (or None) to `update`, store the new state it returns (None deletes it)
+        and return its result. `update` must be fast and must not block.
+        """
+
+    def clear(self) -> None: ...
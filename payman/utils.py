@@ -1,6 +1,22 @@
-from typing import Type
+from typing import Any, Literal, Type, TypeVar
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
+
+Model = TypeVar("Model", bound=BaseModel)
+
+# Per-model validators, built once on first use
+_VALIDATORS: dict[type, TypeAdapter] = {}
+
+
+def get_validator(model_cls: Type[Model]) -> TypeAdapter[Model]:
+    """
+    Return the cached `TypeAdapter` for `model_cls`, building it on first use.
+    """
+
+    validator = _VALIDATORS.get(model_cls)
+    if validator is None:
+        validator = _VALIDATORS[model_cls] = TypeAdapter(model_cls)
+    return validator
 
 
 def to_model_instance(
@@ -24,9 +40,41 @@ def to_model_instance(
     if isinstance(source, model_cls):
         return source
 
-    payload: dict = {}
-    if isinstance(source, dict):
-        payload.update(source)
-    payload.update(overrides)
+    if not overrides:
+        payload = source if isinstance(source, dict) else {}
+    elif isinstance(source, dict):
+        payload = {**source, **overrides}
+    else:
+        payload = overrides
+
+    return get_validator(model_cls).validate_python(payload)
+
+
+def parse_response(
+    data: dict[str, Any],
+    model_cls: Type[Model],
+    mode: Literal["validate", "strict", "construct"] = "validate",
+) -> Model:
+    """
+    Build a response model from data decoded from a gateway response.
+
+    Args:
+        data: Decoded response payload.
+        model_cls: The Pydantic model class to instantiate.
+        mode:
+            - "validate": full validation with type coercion (default).
+            - "strict": validation without coercion; faster for trusted payloads
+              whose types already match the model.
+            - "construct": no validation at all via `model_construct`. Aliases
+              are honored but nested models are left as plain dicts. This only
+              pays off for models with expensive custom validators; for plain
+              models pydantic-core validation is usually faster (see
+              ``benchmarks/bench_models.py``).
+
+    Returns:
+        An instance of `model_cls`.
+    """
 
-    return model_cls.model_validate(payload)
+    if mode == "construct":
+        return model_cls.model_construct(**data)
+    return get_validator(model_cls).validate_python(data, strict=mode == "strict")
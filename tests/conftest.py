@@ -0,0 +1,19 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep the gateway plugin index out of the real home directory."""
+
+    monkeypatch.setenv("PAYMAN_CACHE_DIR", str(tmp_path / "payman-cache"))
+
+
+@pytest.fixture(autouse=True)
+def fresh_retry_budgets():
+    """Start every test with full default retry budgets."""
+
+    from payman.core.http import retry
+
+    retry._shared_budgets.clear()
+    yield
+    retry._shared_budgets.clear()
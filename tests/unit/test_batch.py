@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from payman.core.batch import bounded_map
+from payman.interfaces.gateway_base import GatewayInterface
+
+
+class DummyGateway(GatewayInterface):
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+
+    async def initiate_payment(self, request=None, **kwargs):
+        return {"token": request["amount"]}
+
+    async def verify_payment(self, request=None, **kwargs):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01 * (request["track_id"] % 3))
+        self.in_flight -= 1
+        if request["track_id"] == 4:
+            raise ValueError("unknown track id")
+        return {"verified": request["track_id"]}
+
+    def get_payment_redirect_url(self, token):
+        return f"https://gw/{token}"
+
+
+@pytest.mark.asyncio
+async def test_verify_many_bounds_concurrency_and_reports_errors():
+    gateway = DummyGateway()
+    requests = [{"track_id": i} for i in range(10)]
+
+    results = [result async for result in gateway.verify_many(requests, concurrency=3)]
+
+    assert gateway.peak == 3
+    assert sorted(result.index for result in results) == list(range(10))
+    failed = [result for result in results if not result.ok]
+    assert len(failed) == 1
+    assert failed[0].request == {"track_id": 4}
+    assert isinstance(failed[0].error, ValueError)
+
+
+@pytest.mark.asyncio
+async def test_initiate_many_accepts_async_iterables():
+    async def requests():
+        for amount in (100, 200):
+            yield {"amount": amount}
+
+    gateway = DummyGateway()
+    results = [result async for result in gateway.initiate_many(requests())]
+    assert sorted(result.response["token"] for result in results) == [100, 200]
+
+
+@pytest.mark.asyncio
+async def test_bounded_map_yields_in_completion_order():
+    async def delayed(value):
+        await asyncio.sleep(value / 100)
+        return value
+
+    results = [result.response async for result in bounded_map(delayed, [3, 1, 2], concurrency=3)]
+    assert results == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_bounded_map_cancels_in_flight_calls_when_closed():
+    cancelled = []
+
+    async def slow(value):
+        try:
+            if value:
+                await asyncio.sleep(10)
+            return value
+        except asyncio.CancelledError:
+            cancelled.append(value)
+            raise
+
+    stream = bounded_map(slow, [0, 1, 2], concurrency=3)
+    first = await stream.__anext__()
+    await stream.aclose()
+
+    assert first.response == 0
+    assert sorted(cancelled) == [1, 2]
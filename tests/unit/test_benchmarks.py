@@ -0,0 +1,14 @@
+from benchmarks.run import compare
+
+
+def test_compare_flags_slowdowns_and_throughput_drops():
+    baseline = {"http.request[c=10]": {"us_per_call": 100.0, "calls_per_sec": 1000.0}}
+    results = {"http.request[c=10]": {"us_per_call": 130.0, "calls_per_sec": 700.0}}
+
+    regressions = compare(results, baseline, tolerance=0.2)
+    assert len(regressions) == 2
+    assert compare(results, baseline, tolerance=0.5) == []
+
+
+def test_compare_ignores_new_benchmarks():
+    assert compare({"new": {"us_per_call": 1.0}}, {}, tolerance=0.2) == []
@@ -0,0 +1,177 @@
+import asyncio
+
+import pytest
+
+from payman.core.callbacks import CallbackPipeline, verify_request_from
+from payman.interfaces.callback import CallbackBase
+
+
+class Callback(CallbackBase):
+    def __init__(self, track_id, success=True):
+        self.track_id = track_id
+        self.success = success
+
+    @property
+    def is_success(self) -> bool:
+        return self.success
+
+
+class FakeGateway:
+    def __init__(self, delay=0.01, fail=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.verified = []
+        self.batches = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def verify_payment(self, request):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if request["track_id"] in self.fail:
+                raise RuntimeError(f"declined {request['track_id']}")
+            self.verified.append(request["track_id"])
+            return {"verified": request["track_id"]}
+        finally:
+            self.in_flight -= 1
+
+    def verify_many(self, requests, concurrency=10):
+        from payman.core.batch import bounded_map
+
+        self.batches.append(len(requests))
+        return bounded_map(self.verify_payment, requests, concurrency)
+
+
+def test_verify_request_uses_token_field():
+    assert verify_request_from(Callback(7)) == {"track_id": 7}
+    with pytest.raises(ValueError):
+        verify_request_from(object())
+
+
+@pytest.mark.asyncio
+async def test_callbacks_are_verified_and_resolved():
+    gateway = FakeGateway()
+    async with CallbackPipeline(gateway, workers=2, batch_size=5) as pipeline:
+        futures = [await pipeline.submit(Callback(i)) for i in range(20)]
+        results = await asyncio.gather(*futures)
+
+    assert results == [{"verified": i} for i in range(20)]
+    assert sorted(gateway.verified) == list(range(20))
+    assert gateway.peak <= 10
+    assert max(gateway.batches) <= 5
+
+
+@pytest.mark.asyncio
+async def test_unsuccessful_callbacks_skip_the_gateway():
+    gateway = FakeGateway()
+    async with CallbackPipeline(gateway) as pipeline:
+        future = await pipeline.submit(Callback(1, success=False))
+        assert await future is None
+
+    assert gateway.verified == []
+
+
+@pytest.mark.asyncio
+async def test_duplicate_callbacks_share_one_verification():
+    gateway = FakeGateway()
+    async with CallbackPipeline(gateway, workers=1) as pipeline:
+        first = await pipeline.submit(Callback(5))
+        second = await pipeline.submit(Callback(5))
+        await first
+        third = await pipeline.submit(Callback(5))
+
+    assert first is second is third
+    assert gateway.verified == [5]
+    assert pipeline.deduplicated == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_verification_is_not_cached():
+    gateway = FakeGateway(fail={3})
+    async with CallbackPipeline(gateway, workers=1) as pipeline:
+        future = await pipeline.submit(Callback(3))
+        with pytest.raises(RuntimeError):
+            await future
+        gateway.fail.clear()
+        retry = await pipeline.submit(Callback(3))
+        assert await retry == {"verified": 3}
+
+    assert pipeline.failed == 1
+    assert pipeline.verified == 1
+
+
+@pytest.mark.asyncio
+async def test_full_queue_applies_backpressure():
+    gateway = FakeGateway(delay=0.05)
+    pipeline = CallbackPipeline(gateway, workers=1, max_queue=1, batch_size=1)
+    await pipeline.submit(Callback(1))
+    await asyncio.sleep(0)  # the worker picks the first callback up
+    pipeline.submit_nowait(Callback(2))
+
+    with pytest.raises(asyncio.QueueFull):
+        pipeline.submit_nowait(Callback(3))
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(pipeline.submit(Callback(4)), 0.01)
+
+    await pipeline.close()
+    assert sorted(gateway.verified) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_on_result_notification():
+    seen = []
+
+    async def on_result(callback, result):
+        seen.append((callback.track_id, result.ok))
+
+    async with CallbackPipeline(FakeGateway(), on_result=on_result) as pipeline:
+        await (await pipeline.submit(Callback(9)))
+
+    assert seen == [(9, True)]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_submit_releases_duplicates():
+    pipeline = CallbackPipeline(FakeGateway(delay=0.05), workers=1, max_queue=1, batch_size=1)
+    await pipeline.submit(Callback(1))
+    await asyncio.sleep(0)
+    pipeline.submit_nowait(Callback(2))
+
+    blocked = asyncio.ensure_future(pipeline.submit(Callback(3)))
+    await asyncio.sleep(0)
+    duplicate = await pipeline.submit(Callback(3))
+    blocked.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await blocked
+
+    assert duplicate.cancelled()
+    await pipeline.close()
+
+
+@pytest.mark.asyncio
+async def test_close_without_drain_cancels_in_flight_callbacks():
+    pipeline = CallbackPipeline(FakeGateway(delay=10), workers=1)
+    in_flight = await pipeline.submit(Callback(1))
+    await asyncio.sleep(0.01)
+
+    await pipeline.close(drain=False)
+    assert in_flight.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_callbacks_cancelled_in_queue_can_be_resubmitted():
+    gateway = FakeGateway(delay=10)
+    pipeline = CallbackPipeline(gateway, workers=1, batch_size=1)
+    await pipeline.submit(Callback(1))
+    await asyncio.sleep(0.01)
+    queued = await pipeline.submit(Callback(2))
+    await pipeline.close(drain=False)
+    assert queued.cancelled()
+
+    gateway.delay = 0
+    async with pipeline:
+        retried = await pipeline.submit(Callback(2))
+        assert retried is not queued
+        assert await retried == {"verified": 2}
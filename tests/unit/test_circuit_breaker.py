@@ -0,0 +1,94 @@
+import pytest
+import respx
+from httpx import Response
+
+from payman import GatewayError
+from payman.core.exceptions.base import CircuitOpenError
+from payman.core.exceptions.http import HttpStatusError
+from payman.core.http import breaker as breaker_module
+from payman.core.http.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from payman.core.http.client import AsyncHttpClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(breaker_module.time, "monotonic", fake.monotonic)
+    return fake
+
+
+def test_circuit_opens_on_failure_rate(clock):
+    circuit = CircuitBreaker(min_calls=4, window_size=4).circuit("https://gw/verify")
+    for failed in (False, True, False, True):
+        circuit.before_call()
+        circuit.record(failed, 0.1)
+    assert circuit.state == OPEN
+
+    with pytest.raises(CircuitOpenError) as exc_info:
+        circuit.before_call()
+    assert isinstance(exc_info.value, GatewayError)
+    assert exc_info.value.retry_after == pytest.approx(30.0)
+
+
+def test_circuit_opens_on_slow_calls(clock):
+    circuit = CircuitBreaker(min_calls=2, slow_call_duration=1.0).circuit("k")
+    circuit.record(False, 2.0)
+    circuit.record(False, 1.5)
+    assert circuit.state == OPEN
+
+
+def test_half_open_trial_closes_or_reopens(clock):
+    circuit = CircuitBreaker(min_calls=1, reset_timeout=5.0).circuit("k")
+    circuit.record(True, 0.1)
+    assert circuit.state == OPEN
+
+    clock.now += 5.0
+    circuit.before_call()
+    assert circuit.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        circuit.before_call()
+    circuit.record(True, 0.1)
+    assert circuit.state == OPEN
+
+    clock.now += 5.0
+    circuit.before_call()
+    circuit.record(False, 0.1)
+    assert circuit.state == CLOSED
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_client_fails_fast_while_open():
+    route = respx.post("http://test/verify").mock(return_value=Response(503))
+    breaker = CircuitBreaker(min_calls=2)
+
+    client = AsyncHttpClient(base_url="http://test", circuit_breaker=breaker)
+    for _ in range(2):
+        with pytest.raises(HttpStatusError):
+            await client.request("POST", "/verify")
+
+    other_instance = AsyncHttpClient(base_url="http://test", circuit_breaker=breaker)
+    with pytest.raises(CircuitOpenError):
+        await other_instance.request("POST", "/verify")
+    assert route.call_count == 2
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_client_errors_do_not_trip_circuit():
+    respx.post("http://test/verify").mock(return_value=Response(400))
+    breaker = CircuitBreaker(min_calls=2)
+
+    client = AsyncHttpClient(base_url="http://test", circuit_breaker=breaker)
+    for _ in range(3):
+        with pytest.raises(HttpStatusError):
+            await client.request("POST", "/verify")
+    assert breaker.circuit("http://test/verify").state == CLOSED
@@ -0,0 +1,65 @@
+import json
+import logging
+
+import pytest
+import respx
+from httpx import Response
+
+from payman.core.exceptions.http import InvalidJsonError
+from payman.core.http.client import AsyncHttpClient
+from payman.core.http.codec import OrjsonCodec, StdlibJsonCodec
+
+
+class CountingCodec(StdlibJsonCodec):
+    def __init__(self):
+        self.decoded = 0
+
+    def loads(self, data):
+        self.decoded += 1
+        return super().loads(data)
+
+
+def test_stdlib_codec_round_trip():
+    codec = StdlibJsonCodec()
+    data = codec.dumps({"description": "خرید", "amount": 1000})
+    assert data == '{"description":"خرید","amount":1000}'.encode()
+    assert codec.loads(data) == {"description": "خرید", "amount": 1000}
+    with pytest.raises(ValueError):
+        codec.loads(b"not json")
+
+
+def test_orjson_codec_round_trip():
+    pytest.importorskip("orjson")
+    codec = OrjsonCodec()
+    assert codec.loads(codec.dumps({"a": [1, 2]})) == {"a": [1, 2]}
+    with pytest.raises(ValueError):
+        codec.loads(b"{")
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_client_encodes_and_decodes_once_with_codec():
+    route = respx.post("http://test/request").mock(return_value=Response(200, json={"trackId": 5}))
+    codec = CountingCodec()
+    client = AsyncHttpClient(base_url="http://test", json_codec=codec)
+
+    assert await client.request("POST", "/request", json_data={"amount": 1000}) == {"trackId": 5}
+    assert json.loads(route.calls.last.request.content) == {"amount": 1000}
+    assert route.calls.last.request.headers["content-type"] == "application/json"
+    assert codec.decoded == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_invalid_json_with_custom_codec():
+    respx.get("http://test/broken").mock(return_value=Response(200, content=b"\xff{"))
+    client = AsyncHttpClient(base_url="http://test", json_codec=CountingCodec())
+    with pytest.raises(InvalidJsonError):
+        await client.request("GET", "/broken")
+
+
+def test_response_body_logged_only_at_debug(caplog):
+    client = AsyncHttpClient(log_level=logging.DEBUG)
+    with caplog.at_level(logging.DEBUG, logger="AsyncHttpClient"):
+        client.log_response("POST", "http://test/verify", "سلام".encode(), 0.1)
+    assert "Response Body: سلام" in caplog.text
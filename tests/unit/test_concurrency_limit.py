@@ -0,0 +1,117 @@
+import asyncio
+
+import httpx
+import pytest
+import respx
+from httpx import Response
+
+from payman.core.exceptions.base import ConcurrencyLimitExceededError
+from payman.core.exceptions.http import HttpStatusError, TimeoutError
+from payman.core.http.breaker import CLOSED, CircuitBreaker
+from payman.core.http.client import AsyncHttpClient
+from payman.core.http.concurrency import AIMDLimit, ConcurrencyLimiter, GradientLimit
+
+
+def test_aimd_grows_when_used_and_backs_off_on_drops():
+    aimd = AIMDLimit(backoff_ratio=0.5, timeout=1.0)
+
+    assert aimd.update(10, 0.1, in_flight=8, dropped=False) == 11
+    assert aimd.update(10, 0.1, in_flight=2, dropped=False) == 10
+    assert aimd.update(10, 0.1, in_flight=8, dropped=True) == 5
+    assert aimd.update(10, 2.0, in_flight=8, dropped=False) == 5
+
+
+def test_gradient_shrinks_when_latency_rises():
+    gradient = GradientLimit(smoothing=1.0, short_window=1, long_window=1000)
+    limit = 16.0
+    for _ in range(50):
+        limit = gradient.update(limit, 0.1, in_flight=int(limit), dropped=False)
+    grown = limit
+    assert grown > 16
+
+    for _ in range(5):
+        limit = gradient.update(limit, 1.0, in_flight=int(limit), dropped=False)
+    assert limit < grown
+
+
+@pytest.mark.asyncio
+async def test_limiter_queues_and_sheds_excess():
+    limiter = ConcurrencyLimiter(initial_limit=2, max_queue=1, max_wait=None)
+    await limiter.acquire()
+    await limiter.acquire()
+
+    waiter = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.queued == 1
+    with pytest.raises(ConcurrencyLimitExceededError):
+        await limiter.acquire()
+
+    limiter.release(None)
+    await waiter
+    assert limiter.in_flight == 2
+    assert limiter.shed == 1
+
+
+@pytest.mark.asyncio
+async def test_limiter_wait_times_out():
+    limiter = ConcurrencyLimiter(initial_limit=1, max_wait=0.01)
+    await limiter.acquire()
+
+    with pytest.raises(ConcurrencyLimitExceededError):
+        await limiter.acquire()
+    assert limiter.queued == 0
+
+    limiter.release(None)
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_limit_stays_within_bounds():
+    limiter = ConcurrencyLimiter(AIMDLimit(backoff_ratio=0.1), initial_limit=4, min_limit=2)
+    await limiter.acquire()
+    limiter.release(0.1, dropped=True)
+
+    assert limiter.limit == 2
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_client_feeds_outcomes_into_the_limit():
+    respx.post("https://gw.test/v1/verify").mock(return_value=Response(503))
+    respx.post("https://gw.test/v1/inquiry").mock(side_effect=httpx.ConnectTimeout("slow"))
+    limiter = ConcurrencyLimiter(AIMDLimit(backoff_ratio=0.5), initial_limit=16)
+    client = AsyncHttpClient("https://gw.test/v1", share_connections=False, concurrency_limiter=limiter)
+
+    with pytest.raises(HttpStatusError):
+        await client.request("POST", "/verify", json_data={})
+    assert limiter.limit == 8
+    with pytest.raises(TimeoutError):
+        await client.request("POST", "/inquiry", json_data={})
+    assert limiter.limit == 4
+    assert limiter.in_flight == 0
+    await client.close()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_shed_call_frees_half_open_trial():
+    respx.post("https://gw.test/v1/verify").mock(return_value=Response(200, json={"ok": True}))
+    breaker = CircuitBreaker(min_calls=1, reset_timeout=0.0, half_open_max_calls=1)
+    circuit = breaker.circuit("https://gw.test/v1/verify")
+    circuit.record(True, 0.1)
+    limiter = ConcurrencyLimiter(initial_limit=1, max_queue=0)
+    client = AsyncHttpClient(
+        "https://gw.test/v1",
+        share_connections=False,
+        circuit_breaker=breaker,
+        concurrency_limiter=limiter,
+    )
+
+    await limiter.acquire()
+    with pytest.raises(ConcurrencyLimitExceededError):
+        await client.request("POST", "/verify", json_data={})
+    limiter.release(None)
+
+    assert await client.request("POST", "/verify", json_data={}) == {"ok": True}
+    assert circuit.state == CLOSED
+    await client.close()
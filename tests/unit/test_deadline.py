@@ -0,0 +1,171 @@
+import asyncio
+import time
+
+import pytest
+import respx
+from httpx import Response
+
+import payman
+from payman.core.deadline import remaining
+from payman.core.exceptions.http import DeadlineExceededError, HttpStatusError, TimeoutError
+from payman.core.http.breaker import CircuitBreaker
+from payman.core.http.client import AsyncHttpClient
+from payman.core.http.concurrency import ConcurrencyLimiter
+from payman.core.http.ratelimit import RateLimiter
+from payman.core.http.retry import RetryBudget, RetryPolicy
+
+
+def make_client(**kwargs) -> AsyncHttpClient:
+    return AsyncHttpClient("https://gw.test/v1", share_connections=False, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_nested_deadlines_only_shorten():
+    assert remaining() is None
+    async with payman.deadline(5):
+        with payman.deadline(10):
+            assert remaining() <= 5
+        with payman.deadline(1) as inner:
+            assert inner.remaining <= 1
+        assert 1 < remaining() <= 5
+    assert remaining() is None
+
+
+@pytest.mark.asyncio
+async def test_deadline_follows_child_tasks():
+    async def child():
+        return remaining()
+
+    with payman.deadline(3):
+        assert await asyncio.ensure_future(child()) <= 3
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_attempt_timeouts_shrink_to_the_deadline():
+    seen = []
+
+    def handler(request):
+        seen.append(request.extensions["timeout"])
+        return Response(200, json={"result": 100})
+
+    respx.post("https://gw.test/v1/verify").mock(side_effect=handler)
+    client = make_client(timeout=10)
+
+    await client.request("POST", "/verify", json_data={}, deadline=0.5)
+    await client.request("POST", "/verify", json_data={})
+
+    assert all(0 < value <= 0.5 for value in seen[0].values())
+    assert seen[1]["read"] == 10
+    await client.close()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_retries_stop_when_the_deadline_is_spent():
+    route = respx.post("https://gw.test/v1/verify").mock(
+        return_value=Response(503, headers={"Retry-After": "1"})
+    )
+    budget = RetryBudget(capacity=10.0)
+    client = make_client(retry_policy=RetryPolicy(max_retries=5), retry_budget=budget)
+
+    start = time.monotonic()
+    with pytest.raises(HttpStatusError):
+        async with payman.deadline(0.1):
+            await client.request("POST", "/verify", json_data={})
+
+    assert time.monotonic() - start < 0.1
+    assert route.call_count == 1
+    # A retry the deadline rules out does not spend the shared budget
+    assert budget.tokens == 10.0
+    await client.close()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_expired_deadline_sends_nothing():
+    route = respx.post("https://gw.test/v1/verify").mock(return_value=Response(200, json={}))
+    client = make_client()
+
+    with pytest.raises(DeadlineExceededError) as exc_info:
+        await client.request("POST", "/verify", json_data={}, deadline=0)
+
+    assert isinstance(exc_info.value, TimeoutError)
+    assert route.call_count == 0
+    await client.close()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_attempt_timeouts_account_for_the_limiter_queue():
+    seen = []
+
+    def handler(request):
+        seen.append(request.extensions["timeout"])
+        return Response(200, json={"result": 100})
+
+    respx.post("https://gw.test/v1/verify").mock(side_effect=handler)
+    limiter = ConcurrencyLimiter(initial_limit=1, max_wait=None)
+    client = make_client(timeout=10, concurrency_limiter=limiter)
+
+    await limiter.acquire()
+    asyncio.get_running_loop().call_later(0.3, limiter.release, None)
+    await client.request("POST", "/verify", json_data={}, deadline=0.5)
+
+    assert all(0 < value <= 0.25 for value in seen[0].values())
+    await client.close()
+
+
+def test_expired_deadline_is_not_a_breaker_failure():
+    assert not CircuitBreaker().is_failure(DeadlineExceededError("expired"))
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_does_not_queue_past_the_deadline():
+    limiter = RateLimiter(rate=1, burst=1, max_wait=None)
+    await limiter.acquire("m")
+
+    with payman.deadline(0.05):
+        with pytest.raises(payman.GatewayError):
+            await limiter.acquire("m")
+
+
+@pytest.mark.asyncio
+async def test_deadline_timeout_does_not_count_against_the_gateway():
+    async def slow(reader, writer):
+        await reader.readuntil(b"\r\n\r\n")
+        await asyncio.sleep(0.3)
+        body = b'{"result": 100}'
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+            b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body
+        )
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(slow, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    breaker = CircuitBreaker(min_calls=2)
+    limiter = ConcurrencyLimiter(initial_limit=20)
+    client = AsyncHttpClient(
+        f"http://127.0.0.1:{port}",
+        share_connections=False,
+        timeout=5,
+        retry_policy=RetryPolicy(max_retries=0),
+        circuit_breaker=breaker,
+        concurrency_limiter=limiter,
+    )
+
+    try:
+        for _ in range(4):
+            with pytest.raises(DeadlineExceededError):
+                await client.request("POST", "/verify", json_data={}, deadline=0.1)
+        assert await client.request("POST", "/verify", json_data={}) == {"result": 100}
+    finally:
+        await client.close()
+        server.close()
+        await server.wait_closed()
+
+    assert breaker.circuit(f"http://127.0.0.1:{port}/verify").state == "closed"
+    assert limiter.limit >= 20
+    assert limiter.in_flight == 0
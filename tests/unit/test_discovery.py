@@ -0,0 +1,74 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from payman.core.gateways import discovery, register_gateway
+
+
+class DummyGateway:
+    def __init__(self, token):
+        self.token = token
+
+
+@pytest.fixture
+def fake_entry_points(monkeypatch):
+    scans = []
+
+    def entry_points(group):
+        scans.append(group)
+        return [SimpleNamespace(name="Dummy", value="tests.unit.test_discovery:DummyGateway")]
+
+    monkeypatch.setattr(discovery, "entry_points", entry_points)
+    return scans
+
+
+def test_index_is_reused_until_the_environment_changes(tmp_path, monkeypatch, fake_entry_points):
+    index_path = tmp_path / "gateways.json"
+    expected = {"dummy": "tests.unit.test_discovery.DummyGateway"}
+
+    assert discovery.discover_gateways(index_path) == expected
+    assert discovery.discover_gateways(index_path) == expected
+    assert len(fake_entry_points) == 1
+    assert json.loads(index_path.read_text())["gateways"] == expected
+
+    monkeypatch.setattr(discovery, "environment_fingerprint", lambda: "changed")
+    discovery.discover_gateways(index_path)
+    assert len(fake_entry_points) == 2
+
+
+def test_corrupt_index_triggers_rescan(tmp_path, fake_entry_points):
+    index_path = tmp_path / "gateways.json"
+    index_path.write_text("{not json")
+
+    assert "dummy" in discovery.discover_gateways(index_path)
+    assert len(fake_entry_points) == 1
+
+
+def test_fingerprint_tracks_directory_changes(tmp_path):
+    before = discovery.environment_fingerprint([str(tmp_path)])
+    (tmp_path / "new_dist-1.0.dist-info").mkdir()
+
+    assert discovery.environment_fingerprint([str(tmp_path)]) != before
+
+
+def test_unknown_gateway_is_discovered_lazily(tmp_path, monkeypatch, fake_entry_points):
+    monkeypatch.setenv("PAYMAN_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(register_gateway, "_discovered", False)
+    monkeypatch.setattr(register_gateway, "_GATEWAY_REGISTRY", {"zibal": "zibal.Zibal"})
+
+    gateway = register_gateway.get_gateway_instance("dummy", token="abc")
+
+    assert isinstance(gateway, DummyGateway)
+    assert fake_entry_points == ["payman.gateways"]
+    assert register_gateway._GATEWAY_REGISTRY["dummy"] is DummyGateway
+
+
+def test_explicit_registration_wins(tmp_path, monkeypatch, fake_entry_points):
+    monkeypatch.setenv("PAYMAN_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(register_gateway, "_discovered", False)
+    monkeypatch.setattr(register_gateway, "_GATEWAY_REGISTRY", {"dummy": "custom.Gateway"})
+
+    register_gateway.load_plugins()
+
+    assert register_gateway._GATEWAY_REGISTRY["dummy"] == "custom.Gateway"
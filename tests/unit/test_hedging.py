@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+import respx
+from httpx import Response
+
+from payman.core.http.client import AsyncHttpClient
+from payman.core.http.hedging import HedgePolicy
+from payman.core.http.retry import RetryBudget
+
+
+def responder(delays):
+    calls = iter(delays)
+
+    async def respond(request):
+        respond.sent += 1
+        await asyncio.sleep(next(calls))
+        return Response(200, json={"result": 100})
+
+    respond.sent = 0
+    return respond
+
+
+def test_percentile_delay_needs_samples():
+    policy = HedgePolicy(min_samples=10, percentile=0.9, min_delay=0.0)
+    for i in range(9):
+        policy.observe("http://test/verify", i / 100)
+    assert policy.delay_for("http://test/verify") is None
+
+    policy.observe("http://test/verify", 0.09)
+    assert policy.delay_for("http://test/verify") == pytest.approx(0.09)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_slow_request_is_hedged_and_loser_cancelled():
+    upstream = responder([5.0, 0.0])
+    route = respx.post("http://test/verify").mock(side_effect=upstream)
+    policy = HedgePolicy(delay=0.01)
+    client = AsyncHttpClient(base_url="http://test", hedging=policy)
+
+    response = await asyncio.wait_for(client.request("POST", "/verify"), timeout=1.0)
+    assert response == {"result": 100}
+    assert upstream.sent == 2
+    # Only the winner completed; the slow original was cancelled
+    assert route.call_count == 1
+    assert policy.hedged == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_fast_and_non_idempotent_requests_are_not_hedged():
+    verify = respx.post("http://test/verify").mock(side_effect=responder([0.0]))
+    initiate = respx.post("http://test/request").mock(side_effect=responder([0.05]))
+    policy = HedgePolicy(delay=0.01)
+    client = AsyncHttpClient(base_url="http://test", hedging=policy)
+
+    await client.request("POST", "/verify")
+    await client.request("POST", "/request")
+    assert (verify.call_count, initiate.call_count, policy.hedged) == (1, 1, 0)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_hedges_are_capped_by_budget():
+    respond = responder([0.03] * 10)
+    respx.post("http://test/verify").mock(side_effect=respond)
+    policy = HedgePolicy(delay=0.01, budget=RetryBudget(ratio=0.0, capacity=1.0))
+    client = AsyncHttpClient(base_url="http://test", hedging=policy)
+
+    await client.request("POST", "/verify")
+    await client.request("POST", "/verify")
+    assert policy.hedged == 1
+    # respx does not count the cancelled loser, so count sends in the responder
+    assert respond.sent == 3
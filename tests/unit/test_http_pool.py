@@ -0,0 +1,113 @@
+import asyncio
+import threading
+
+import pytest
+import respx
+from httpx import Response
+
+from payman.core.http.client import AsyncHttpClient
+from payman.core.http.pool import close_shared_clients, shared_pool
+
+
+@pytest.mark.asyncio
+async def test_instances_share_client_per_origin_and_settings():
+    first = AsyncHttpClient(base_url="http://test")
+    second = AsyncHttpClient(base_url="http://test/v1")
+    other_host = AsyncHttpClient(base_url="http://other")
+    other_settings = AsyncHttpClient(base_url="http://test", timeout=3.0)
+
+    client = await first._ensure_client()
+    assert await second._ensure_client() is client
+    assert await other_host._ensure_client() is not client
+    assert await other_settings._ensure_client() is not client
+
+    await close_shared_clients()
+    assert client.is_closed
+    assert len(shared_pool) == 0
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_close_keeps_shared_client_open():
+    respx.get("http://test/ping").mock(return_value=Response(200, json={"ok": True}))
+
+    async with AsyncHttpClient(base_url="http://test") as client:
+        assert await client.request("GET", "/ping") == {"ok": True}
+    shared = await AsyncHttpClient(base_url="http://test")._ensure_client()
+    assert not shared.is_closed
+
+    await close_shared_clients()
+
+
+@pytest.mark.asyncio
+async def test_private_client_when_sharing_disabled():
+    client = AsyncHttpClient(base_url="http://test", share_connections=False)
+    private = await client._ensure_client()
+    assert private is not await AsyncHttpClient(base_url="http://test")._ensure_client()
+
+    await client.close()
+    assert private.is_closed
+    await close_shared_clients()
+
+
+@pytest.mark.asyncio
+async def test_connection_tuning_is_applied_to_pooled_client():
+    client = AsyncHttpClient(
+        base_url="http://test",
+        timeout=5.0,
+        connect_timeout=1.0,
+        pool_timeout=0.5,
+        max_connections=7,
+        max_keepalive_connections=3,
+        keepalive_expiry=30.0,
+    )
+    assert client.timeouts.connect == 1.0
+    assert client.timeouts.read == 5.0
+    assert client.timeouts.pool == 0.5
+
+    pooled = await client._ensure_client()
+    assert pooled.timeout == client.timeouts
+    assert pooled is not await AsyncHttpClient(base_url="http://test", timeout=5.0)._ensure_client()
+
+    await close_shared_clients()
+
+
+def test_one_client_per_event_loop_closed_with_the_loop():
+    gateway_client = AsyncHttpClient(base_url="http://test")
+
+    async def borrow():
+        first = await gateway_client._ensure_client()
+        assert await gateway_client._ensure_client() is first
+        return first
+
+    first = asyncio.run(borrow())
+    second = asyncio.run(borrow())
+
+    assert first is not second
+    assert first.is_closed and second.is_closed
+    assert len(shared_pool) == 0
+
+
+def test_client_shared_across_threads_gets_a_client_per_loop():
+    gateway_client = AsyncHttpClient(base_url="http://test", share_connections=False)
+    barrier = threading.Barrier(4)
+    borrowed = []
+
+    async def borrow():
+        client = await gateway_client._ensure_client()
+        # Keep every loop alive until all threads have borrowed a client
+        await asyncio.to_thread(barrier.wait)
+        return client
+
+    def worker():
+        borrowed.append(asyncio.run(borrow()))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(client) for client in borrowed}) == 4
+    assert all(client.is_closed for client in borrowed)
+    assert len(gateway_client._private_pool) == 0
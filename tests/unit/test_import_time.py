@@ -0,0 +1,46 @@
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ("httpx", "pydantic", "payman.core.http.client", "payman.interfaces.gateway_base")
+
+
+def loaded_after(statement: str) -> set[str]:
+    code = (
+        f"import sys\n{statement}\n"
+        f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return set(result.stdout.split())
+
+
+def test_import_payman_skips_heavy_dependencies():
+    assert loaded_after("import payman") == set()
+    assert loaded_after("from payman import GatewayError") == set()
+
+
+def test_http_package_loads_only_what_is_used():
+    loaded = loaded_after("from payman.core.http import RetryPolicy")
+
+    assert "httpx" not in loaded
+    assert "payman.core.http.client" not in loaded
+
+
+def test_lazy_attributes_load_on_first_access():
+    import payman
+    from payman.core import http
+    from payman.core.gateways.wrapper import Payman
+
+    assert payman.Payman is Payman
+    assert "PaymanRouter" in dir(payman)
+    assert http.AsyncHttpClient.__name__ == "AsyncHttpClient"
+
+
+def test_unknown_attribute_raises_attribute_error():
+    import payman
+
+    with pytest.raises(AttributeError, match="missing"):
+        payman.missing
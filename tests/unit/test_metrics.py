@@ -0,0 +1,73 @@
+import pytest
+import respx
+from httpx import Response
+
+from payman.core.exceptions.http import HttpStatusError
+from payman.core.http.client import AsyncHttpClient
+from payman.core.http.metrics import Histogram, MetricsHook, MetricsRegistry
+
+
+class RecordingHook(MetricsHook):
+    def __init__(self):
+        self.events = []
+
+    def on_request_start(self, event):
+        self.events.append(("start", event.attempt))
+
+    def on_request_end(self, event):
+        self.events.append(("end", event.gateway, event.endpoint, event.status))
+
+    def on_request_error(self, event):
+        self.events.append(("error", event.status, type(event.error).__name__))
+
+
+def test_histogram_quantiles():
+    histogram = Histogram(buckets=(0.1, 0.2, 0.4))
+    for value in (0.05, 0.15, 0.15, 0.3):
+        histogram.observe(value)
+    assert histogram.counts == [1, 2, 1, 0]
+    assert histogram.quantile(0.5) == pytest.approx(0.15)
+    assert histogram.quantile(1.0) == pytest.approx(0.4)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_hooks_receive_attempt_lifecycle(monkeypatch):
+    respx.post("http://test/v1/verify").mock(
+        side_effect=[Response(503), Response(200, json={"result": 100})]
+    )
+    hook = RecordingHook()
+    client = AsyncHttpClient(
+        base_url="http://test/v1", max_retries=1, retry_delay=0, metrics_hooks=[hook]
+    )
+
+    await client.request("POST", "/verify")
+    assert hook.events == [
+        ("start", 0),
+        ("error", 503, "HttpStatusError"),
+        ("start", 1),
+        ("end", "test", "/v1/verify", 200),
+    ]
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_registry_renders_prometheus_text():
+    respx.post("http://test/verify").mock(return_value=Response(200, json={}))
+    respx.post("http://test/request").mock(return_value=Response(500))
+    registry = MetricsRegistry(buckets=(0.5, 1.0))
+    client = AsyncHttpClient(base_url="http://test", metrics_hooks=[registry])
+
+    await client.request("POST", "/verify")
+    with pytest.raises(HttpStatusError):
+        await client.request("POST", "/request")
+
+    assert registry.histogram("test", "/verify").count == 1
+    text = registry.render_prometheus()
+    assert 'payman_requests_total{gateway="test",endpoint="/verify",method="POST",status="200"} 1' in text
+    assert (
+        'payman_request_errors_total{gateway="test",endpoint="/request",method="POST",'
+        'error="HttpStatusError"} 1'
+    ) in text
+    assert 'payman_request_duration_seconds_bucket{gateway="test",endpoint="/verify",method="POST",le="+Inf"} 1' in text
+    assert "# TYPE payman_request_duration_seconds histogram" in text
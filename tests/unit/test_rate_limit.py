@@ -0,0 +1,128 @@
+import asyncio
+import time
+
+import pytest
+import respx
+from httpx import Response
+
+from payman import GatewayError
+from payman.core.exceptions.base import CircuitOpenError, RateLimitExceededError
+from payman.core.exceptions.http import HttpStatusError
+from payman.core.http.breaker import CircuitBreaker
+from payman.core.http.client import AsyncHttpClient
+from payman.core.http.ratelimit import RateLimiter, TokenBucket
+
+
+def test_bucket_allows_burst_then_reserves_future_tokens():
+    bucket = TokenBucket(rate=10, burst=2)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+    assert bucket.reserve(max_wait=0.1) is None
+
+
+def test_bucket_pause_delays_next_token():
+    bucket = TokenBucket(rate=10, burst=5)
+    bucket.pause(2.0)
+
+    assert bucket.reserve() == pytest.approx(2.0, abs=0.01)
+
+
+def test_buckets_per_key_and_endpoint():
+    limiter = RateLimiter(rate=5, per_endpoint=True, endpoint_rates={"/verify": 20})
+
+    assert limiter.bucket("m1", "/v1/request") is not limiter.bucket("m2", "/v1/request")
+    assert limiter.bucket("m1", "/v1/request") is not limiter.bucket("m1", "/v1/inquiry")
+    assert limiter.bucket("m1", "/v1/verify").rate == 20
+    assert RateLimiter(rate=5).bucket("m1", "/a") is not None
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_then_fails_fast():
+    limiter = RateLimiter(rate=20, burst=1, max_wait=0.06)
+
+    start = time.monotonic()
+    await limiter.acquire("m")
+    await limiter.acquire("m")
+    assert time.monotonic() - start >= 0.04
+
+    # Concurrent callers queue behind each other until the wait exceeds max_wait
+    results = await asyncio.gather(
+        *(limiter.acquire("m") for _ in range(3)), return_exceptions=True
+    )
+    assert results[0] == pytest.approx(0.05, abs=0.02)
+    assert all(isinstance(result, RateLimitExceededError) for result in results[1:])
+    assert isinstance(results[1], GatewayError)
+    assert results[1].retry_after > 0.06
+    assert limiter.rejected == 2
+    assert limiter.queued_time.count == limiter.acquired
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_returns_its_token():
+    limiter = RateLimiter(rate=10, burst=1, max_wait=None)
+    await limiter.acquire("m")
+    waiter = asyncio.ensure_future(limiter.acquire("m"))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert limiter.bucket("m").reserve() == pytest.approx(0.1, abs=0.02)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_client_rejects_requests_over_the_limit():
+    route = respx.post("https://gw.test/v1/verify").mock(
+        return_value=Response(200, json={"result": 100})
+    )
+    limiter = RateLimiter(rate=1, burst=2, max_wait=0)
+    client = AsyncHttpClient(
+        "https://gw.test/v1", share_connections=False, rate_limiter=limiter, rate_limit_key="zibal:m1"
+    )
+
+    await client.request("POST", "/verify", json_data={})
+    await client.request("POST", "/verify", json_data={})
+    with pytest.raises(RateLimitExceededError):
+        await client.request("POST", "/verify", json_data={})
+
+    assert route.call_count == 2
+    await client.close()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_429_pauses_the_bucket():
+    respx.post("https://gw.test/v1/request").mock(
+        return_value=Response(429, headers={"Retry-After": "30"})
+    )
+    limiter = RateLimiter(rate=100, max_wait=1.0)
+    client = AsyncHttpClient("https://gw.test/v1", share_connections=False, rate_limiter=limiter)
+
+    with pytest.raises(HttpStatusError):
+        await client.request("POST", "/request", json_data={})
+    with pytest.raises(RateLimitExceededError):
+        await client.request("POST", "/request", json_data={})
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast_without_spending_tokens():
+    breaker = CircuitBreaker(min_calls=1)
+    breaker.circuit("https://gw.test/v1/verify").record(True, 0.1)
+    limiter = RateLimiter(rate=0.001, burst=1, max_wait=1.0)
+    client = AsyncHttpClient(
+        "https://gw.test/v1", share_connections=False, circuit_breaker=breaker, rate_limiter=limiter
+    )
+
+    start = time.monotonic()
+    for _ in range(3):
+        with pytest.raises(CircuitOpenError):
+            await client.request("POST", "/verify", json_data={})
+
+    assert time.monotonic() - start < 0.1
+    assert limiter.acquired == 0
+    await client.close()
@@ -0,0 +1,133 @@
+import pytest
+
+from payman.core.exceptions.base import CircuitOpenError
+from payman.core.exceptions.http import TimeoutError
+from payman.core.journal import JournaledGateway, PaymentJournal
+from payman.core.reconcile import Reconciler
+
+
+class FakeGateway:
+    def __init__(self, paid=()):
+        self.paid = set(paid)
+        self.verify_calls = []
+        self.next_track_id = 1
+
+    async def initiate_payment(self, request=None, **kwargs):
+        track_id = self.next_track_id
+        self.next_track_id += 1
+        return {"result": 100, "trackId": track_id}
+
+    async def verify_payment(self, request=None, **kwargs):
+        track_id = (request or kwargs)["trackId"]
+        self.verify_calls.append(track_id)
+        if track_id in self.paid:
+            return {"result": 100, "trackId": track_id}
+        return {"result": 202, "trackId": track_id}
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = PaymentJournal(str(tmp_path / "journal.db"))
+    yield journal
+    journal.close()
+
+
+async def initiate(journal, gateway, count):
+    journaled = JournaledGateway(gateway, journal, name="zibal")
+    for _ in range(count):
+        await journaled.initiate_payment({"amount": 1000}, callback_url="https://shop.test/cb")
+    return journaled
+
+
+@pytest.mark.asyncio
+async def test_initiate_and_verify_are_journaled(journal):
+    gateway = FakeGateway(paid={1})
+    journaled = await initiate(journal, gateway, 1)
+
+    await journaled.verify_payment({"trackId": 1})
+
+    events = journal.history("zibal", 1)
+    assert [entry.event for entry in events] == ["initiated", "verified"]
+    assert events[0].data["request"] == {"amount": 1000, "callback_url": "https://shop.test/cb"}
+    assert events[0].data["verify"] == {"trackId": 1}
+    assert journal.pending() == []
+
+
+@pytest.mark.asyncio
+async def test_reconciler_verifies_pending_payments(journal):
+    gateway = FakeGateway(paid={1, 3})
+    await initiate(journal, gateway, 4)
+    reconciler = Reconciler(journal, {"zibal": gateway}, concurrency=2, chunk_size=3, older_than=0)
+
+    results = [result async for result in reconciler.run()]
+
+    assert len(results) == 4
+    assert (reconciler.verified, reconciler.failed) == (2, 2)
+    assert [entry.token for entry in journal.pending()] == ["2", "4"]
+    assert journal.checkpoint("default") == 0
+
+
+@pytest.mark.asyncio
+async def test_old_unpaid_payments_expire(journal):
+    gateway = FakeGateway()
+    await initiate(journal, gateway, 2)
+    reconciler = Reconciler(journal, {"zibal": gateway}, older_than=0, expire_after=0)
+
+    [result async for result in reconciler.run()]
+
+    assert reconciler.expired == 2
+    assert journal.pending() == []
+
+
+@pytest.mark.asyncio
+async def test_unreachable_gateway_never_expires_payments(journal):
+    class Unreachable(FakeGateway):
+        async def verify_payment(self, request=None, **kwargs):
+            if request["trackId"] == 1:
+                raise TimeoutError("read timed out")
+            raise CircuitOpenError("https://gw/verify", 30.0)
+
+    await initiate(journal, Unreachable(), 2)
+    reconciler = Reconciler(journal, {"zibal": Unreachable()}, older_than=0, expire_after=0)
+
+    results = [result async for result in reconciler.run()]
+
+    assert not any(result.ok for result in results)
+    assert (reconciler.failed, reconciler.expired) == (2, 0)
+    assert [entry.token for entry in journal.pending()] == ["1", "2"]
+
+
+@pytest.mark.asyncio
+async def test_interrupted_run_resumes_from_checkpoint(journal):
+    gateway = FakeGateway()
+    await initiate(journal, gateway, 10)
+    reconciler = Reconciler(
+        journal, {"zibal": gateway}, concurrency=1, older_than=0, checkpoint_every=2
+    )
+
+    stream = reconciler.run()
+    for _ in range(5):
+        await stream.__anext__()
+    await stream.aclose()
+    assert journal.checkpoint("default") == 5
+
+    # Still-pending entries before the checkpoint are skipped on resume
+    gateway.verify_calls.clear()
+    [result async for result in reconciler.run()]
+    assert gateway.verify_calls == [6, 7, 8, 9, 10]
+    assert journal.checkpoint("default") == 0
+
+    # A completed run starts over, retrying everything still pending
+    gateway.verify_calls.clear()
+    [result async for result in reconciler.run()]
+    assert gateway.verify_calls == list(range(1, 11))
+
+
+@pytest.mark.asyncio
+async def test_recent_payments_are_left_alone(journal):
+    gateway = FakeGateway()
+    await initiate(journal, gateway, 2)
+    reconciler = Reconciler(journal, {"zibal": gateway}, older_than=600)
+
+    assert [result async for result in reconciler.run()] == []
+    assert gateway.verify_calls == []
@@ -0,0 +1,108 @@
+import pytest
+import respx
+from httpx import Response
+
+from payman.core.http import cache as cache_module
+from payman.core.http.cache import (
+    MemoryCacheBackend,
+    ResponseCache,
+    SQLiteCacheBackend,
+    is_terminal_success
+)
+from payman.core.http.client import AsyncHttpClient
+
+
+def test_terminal_success_detection():
+    assert is_terminal_success({"result": 100})
+    assert is_terminal_success({"result": 201})
+    assert is_terminal_success({"data": {"code": 101}})
+    assert not is_terminal_success({"result": 102})
+    assert not is_terminal_success({"data": [], "errors": {"code": -9}})
+
+
+def test_pending_inquiry_is_not_terminal():
+    # The inquiry succeeded (100) but the payment is still pending or unverified
+    assert not is_terminal_success({"result": 100, "status": -1})
+    assert not is_terminal_success({"result": 100, "status": 2})
+    assert not is_terminal_success({"data": {"code": 100, "status": "PAID"}})
+    assert is_terminal_success({"result": 100, "status": 1})
+    assert is_terminal_success({"data": {"code": 100, "status": "VERIFIED"}})
+
+
+def test_memory_backend_evicts_lru_and_expires(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    backend = MemoryCacheBackend(maxsize=2)
+
+    backend.set("a", 1, ttl=10)
+    backend.set("b", 2, ttl=10)
+    backend.get("a")
+    backend.set("c", 3, ttl=10)
+    assert backend.get("b") is None
+    assert backend.get("a") == 1
+
+    now[0] = 10.0
+    assert backend.get("a") is None
+    assert len(backend) == 1
+
+
+def test_sqlite_backend_round_trip(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.db"))
+    backend.set("k", {"result": 100}, ttl=60)
+    assert backend.get("k") == {"result": 100}
+    backend.delete("k")
+    assert backend.get("k") is None
+    backend.close()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_client_caches_only_terminal_verify_responses():
+    verify = respx.post("http://test/verify").mock(
+        side_effect=[
+            Response(200, json={"result": 102}),
+            Response(200, json={"result": 100, "refNumber": 7}),
+            Response(200, json={"result": 100, "refNumber": 8}),
+        ]
+    )
+    cache = ResponseCache()
+    client = AsyncHttpClient(base_url="http://test", response_cache=cache)
+
+    for _ in range(3):
+        response = await client.request("POST", "/verify", json_data={"trackId": 1})
+    assert response == {"result": 100, "refNumber": 7}
+    assert verify.call_count == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    cache.invalidate("POST", "http://test/verify", {"trackId": 1})
+    response = await client.request("POST", "/verify", json_data={"trackId": 1})
+    assert response["refNumber"] == 8
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_client_does_not_cache_other_endpoints():
+    route = respx.post("http://test/request").mock(return_value=Response(200, json={"result": 100}))
+    client = AsyncHttpClient(base_url="http://test", response_cache=ResponseCache())
+
+    await client.request("POST", "/request", json_data={"amount": 1000})
+    await client.request("POST", "/request", json_data={"amount": 1000})
+    assert route.call_count == 2
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_client_refetches_pending_inquiry():
+    inquiry = respx.post("http://test/inquiry").mock(
+        side_effect=[
+            Response(200, json={"result": 100, "status": -1}),
+            Response(200, json={"result": 100, "status": 1}),
+            Response(200, json={"result": 100, "status": 1}),
+        ]
+    )
+    client = AsyncHttpClient(base_url="http://test", response_cache=ResponseCache())
+
+    for _ in range(3):
+        response = await client.request("POST", "/inquiry", json_data={"trackId": 1})
+    assert response == {"result": 100, "status": 1}
+    assert inquiry.call_count == 2
@@ -0,0 +1,109 @@
+import pytest
+import respx
+from httpx import Response
+
+from payman.core.exceptions.http import HttpStatusError, TimeoutError
+from payman.core.http import client as client_module
+from payman.core.http.client import AsyncHttpClient
+from payman.core.http.retry import RetryBudget, RetryPolicy, parse_retry_after, shared_retry_budget
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(client_module.asyncio, "sleep", fake_sleep)
+    return delays
+
+
+def test_policy_classifies_errors():
+    policy = RetryPolicy()
+    assert policy.is_retryable(TimeoutError("slow"))
+    assert policy.is_retryable(HttpStatusError(503, "unavailable"))
+    assert not policy.is_retryable(HttpStatusError(400, "bad request"))
+
+
+def test_backoff_uses_full_jitter_within_cap():
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+    for attempt in range(6):
+        delay = policy.get_delay(attempt, TimeoutError("slow"))
+        assert 0 <= delay <= min(5.0, 2 ** attempt)
+
+
+def test_retry_after_is_honored_and_capped():
+    policy = RetryPolicy(max_delay=10.0)
+    assert policy.get_delay(0, HttpStatusError(429, "slow down", headers={"retry-after": "7"})) == 7.0
+    assert policy.get_delay(0, HttpStatusError(429, "slow down", headers={"retry-after": "60"})) == 10.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+
+
+def test_budget_caps_retries():
+    budget = RetryBudget(ratio=0.5, capacity=1.0)
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_client_does_not_retry_client_errors(sleeps):
+    route = respx.get("http://test/fail").mock(return_value=Response(400, text="Bad Request"))
+
+    client = AsyncHttpClient(base_url="http://test", max_retries=3)
+    with pytest.raises(HttpStatusError):
+        await client.request("GET", "/fail")
+    assert route.call_count == 1
+    assert sleeps == []
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_client_retries_transient_status_with_retry_after(sleeps):
+    route = respx.get("http://test/flaky").mock(
+        side_effect=[
+            Response(503, headers={"Retry-After": "2"}),
+            Response(200, json={"ok": True}),
+        ]
+    )
+
+    client = AsyncHttpClient(base_url="http://test", max_retries=3)
+    assert await client.request("GET", "/flaky") == {"ok": True}
+    assert route.call_count == 2
+    assert sleeps == [2.0]
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_client_stops_when_budget_is_exhausted(sleeps):
+    route = respx.get("http://test/down").mock(return_value=Response(503))
+
+    client = AsyncHttpClient(
+        base_url="http://test",
+        max_retries=5,
+        retry_budget=RetryBudget(ratio=0.0, capacity=2.0),
+    )
+    with pytest.raises(HttpStatusError):
+        await client.request("GET", "/down")
+    assert route.call_count == 3
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_default_budget_is_shared_per_origin(sleeps):
+    route = respx.get("http://test/down").mock(return_value=Response(503))
+
+    # A new client per request, as with gateways built in a request handler
+    for _ in range(5):
+        with pytest.raises(HttpStatusError):
+            await AsyncHttpClient(base_url="http://test", max_retries=5).request("GET", "/down")
+
+    assert AsyncHttpClient(base_url="http://test/v1").retry_budget is shared_retry_budget("http://test")
+    assert AsyncHttpClient(base_url="http://other").retry_budget is not shared_retry_budget("http://test")
+    # 5 first attempts plus the 10 retries of one full budget, not 5 each
+    assert route.call_count == 5 + 10
@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+from payman import PaymanRouter
+from payman.core.gateways.router import GatewayStats
+from payman.interfaces.gateway_base import GatewayInterface
+
+
+class FakeGateway(GatewayInterface):
+    def __init__(self, name, fail=False):
+        self.name = name
+        self.fail = fail
+        self.verified = []
+
+    async def initiate_payment(self, request=None, **kwargs):
+        if self.fail:
+            raise ConnectionError(f"{self.name} down")
+        return {"track_id": f"{self.name}-{kwargs['amount']}"}
+
+    async def verify_payment(self, request=None, **kwargs):
+        self.verified.append(kwargs["track_id"])
+        return {"verified_by": self.name}
+
+    def get_payment_redirect_url(self, token):
+        return f"https://{self.name}/{token}"
+
+
+def test_stats_ewma():
+    stats = GatewayStats(alpha=0.5)
+    stats.record(1.0, failed=False)
+    stats.record(3.0, failed=False)
+    stats.record(9.0, failed=True)
+    assert stats.latency == 2.0
+    assert stats.error_rate == 0.5
+
+
+def test_least_latency_prefers_fast_healthy_gateway():
+    router = PaymanRouter({"a": FakeGateway("a"), "b": FakeGateway("b")})
+    router.stats["a"].record(0.5, failed=False)
+    router.stats["b"].record(0.2, failed=False)
+    assert router.rank()[0] == "b"
+
+    router.stats["b"].error_rate = 0.9
+    assert router.rank() == ["a", "b"]
+
+
+def test_weighted_policy_ranks_every_gateway():
+    router = PaymanRouter({"a": FakeGateway("a"), "b": FakeGateway("b")}, policy="weighted")
+    assert sorted(router.rank()) == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_verify_is_pinned_to_issuing_gateway():
+    a, b = FakeGateway("a"), FakeGateway("b")
+    router = PaymanRouter({"a": a, "b": b})
+    router.stats["a"].record(0.1, failed=False)
+    router.stats["b"].record(0.9, failed=False)
+
+    response = await router.initiate_payment(amount=100)
+    assert response == {"track_id": "a-100"}
+
+    router.stats["a"].record(5.0, failed=False)
+    assert await router.verify_payment(track_id="a-100") == {"verified_by": "a"}
+    assert router.get_payment_redirect_url("a-100") == "https://a/a-100"
+    assert b.verified == []
+
+    with pytest.raises(KeyError):
+        await router.verify_payment(track_id="unknown")
+
+
+@pytest.mark.asyncio
+async def test_initiate_fails_over_to_next_gateway():
+    router = PaymanRouter({"a": FakeGateway("a", fail=True), "b": FakeGateway("b")})
+    response = await router.initiate_payment(amount=5)
+    assert response == {"track_id": "b-5"}
+    assert router.stats["a"].error_rate > 0
+    assert router.pinned_name("b-5") == "b"
+
+
+@pytest.mark.asyncio
+async def test_unhealthy_gateway_is_probed_and_recovers():
+    a, b = FakeGateway("a", fail=True), FakeGateway("b")
+    router = PaymanRouter({"a": a, "b": b}, probe_interval=0.05)
+
+    for _ in range(4):
+        assert await router.initiate_payment(amount=1) == {"track_id": "b-1"}
+    assert router.stats["a"].error_rate > router.max_error_rate
+
+    a.fail = False
+    assert await router.initiate_payment(amount=2) == {"track_id": "b-2"}
+    await asyncio.sleep(0.06)
+    assert await router.initiate_payment(amount=3) == {"track_id": "a-3"}
+    assert router.stats["a"].error_rate <= router.max_error_rate
+
+
+@pytest.mark.asyncio
+async def test_caller_errors_do_not_fail_over():
+    class Rejecting(FakeGateway):
+        async def initiate_payment(self, request=None, **kwargs):
+            raise ValueError("amount is required")
+
+    router = PaymanRouter({"a": Rejecting("a"), "b": FakeGateway("b")})
+    with pytest.raises(ValueError):
+        await router.initiate_payment()
+
+    assert router.stats["a"].error_rate == 0.0
+    assert router.stats["b"].calls == 0
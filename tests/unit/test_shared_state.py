@@ -0,0 +1,132 @@
+import multiprocessing
+import time
+
+import pytest
+
+from payman.core.exceptions.base import CircuitOpenError, RateLimitExceededError
+from payman.core.http.breaker import CLOSED, OPEN, CircuitBreaker
+from payman.core.http.ratelimit import RateLimiter
+from payman.core.http.retry import SharedRetryBudget
+from payman.core.http.shared_state import MemoryStateBackend, SQLiteStateBackend
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        yield MemoryStateBackend()
+    else:
+        backend = SQLiteStateBackend(str(tmp_path / "state.db"))
+        yield backend
+        backend.close()
+
+
+def test_transact_reads_updates_and_deletes(backend):
+    assert backend.transact("k", lambda state: ({"n": 1}, state)) is None
+    assert backend.transact("k", lambda state: ({"n": state["n"] + 1}, state["n"])) == 1
+    assert backend.transact("k", lambda state: (None, state["n"])) == 2
+    assert backend.transact("k", lambda state: (state, state)) is None
+
+
+def test_failed_update_leaves_state_unchanged(backend):
+    backend.transact("k", lambda state: ({"n": 1}, None))
+
+    def broken(state):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        backend.transact("k", broken)
+    assert backend.transact("k", lambda state: (state, state)) == {"n": 1}
+
+
+@pytest.mark.asyncio
+async def test_limiters_sharing_a_backend_share_one_bucket(backend):
+    first = RateLimiter(rate=0.001, burst=2, max_wait=0, shared_state=backend)
+    second = RateLimiter(rate=0.001, burst=2, max_wait=0, shared_state=backend)
+
+    await first.acquire("zibal:m1")
+    await second.acquire("zibal:m1")
+    with pytest.raises(RateLimitExceededError):
+        await first.acquire("zibal:m1")
+    await second.acquire("zibal:m2")
+
+
+def test_shared_retry_budget(backend):
+    first = SharedRetryBudget(backend, ratio=0.5, capacity=1.0)
+    second = SharedRetryBudget(backend, ratio=0.5, capacity=1.0)
+
+    assert first.withdraw()
+    assert not second.withdraw()
+    first.deposit()
+    second.deposit()
+    assert second.withdraw()
+
+
+def test_circuit_state_is_shared(backend):
+    settings = dict(min_calls=2, window_size=2, shared_state=backend)
+    first = CircuitBreaker(**settings).circuit("https://gw/verify")
+    second = CircuitBreaker(**settings).circuit("https://gw/verify")
+
+    first.record(True, 0.1)
+    second.record(True, 0.1)
+
+    assert second.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        first.before_call()
+
+
+def test_trial_slot_of_a_dead_worker_is_reclaimed(tmp_path):
+    path = str(tmp_path / "state.db")
+    settings = dict(min_calls=1, reset_timeout=0.05, half_open_max_calls=1)
+    crashed = CircuitBreaker(**settings, shared_state=SQLiteStateBackend(path)).circuit("k")
+    survivor = CircuitBreaker(**settings, shared_state=SQLiteStateBackend(path)).circuit("k")
+
+    crashed.record(True, 0.1)
+    time.sleep(0.06)
+    crashed.before_call()  # takes the trial slot, then never reports back
+    with pytest.raises(CircuitOpenError):
+        survivor.before_call()
+
+    time.sleep(0.06)
+    survivor.before_call()
+    survivor.record(False, 0.1)
+    assert survivor.state == CLOSED
+
+
+def test_closed_circuit_admits_without_writing(tmp_path):
+    backend = SQLiteStateBackend(str(tmp_path / "state.db"))
+    circuit = CircuitBreaker(shared_state=backend).circuit("k")
+    circuit.record(False, 0.1)
+    conn = backend._connection()
+    writes = conn.total_changes
+
+    for _ in range(10):
+        circuit.before_call()
+
+    assert conn.total_changes == writes
+    backend.close()
+
+
+def _take_tokens(path: str, attempts: int) -> int:
+    import asyncio
+
+    limiter = RateLimiter(rate=0.001, burst=20, max_wait=0, shared_state=SQLiteStateBackend(path))
+
+    async def take() -> int:
+        taken = 0
+        for _ in range(attempts):
+            try:
+                await limiter.acquire("zibal:m1")
+                taken += 1
+            except RateLimitExceededError:
+                pass
+        return taken
+
+    return asyncio.run(take())
+
+
+def test_worker_processes_enforce_one_combined_budget(tmp_path):
+    path = str(tmp_path / "state.db")
+    with multiprocessing.get_context("fork").Pool(4) as pool:
+        taken = pool.starmap(_take_tokens, [(path, 10)] * 4)
+
+    assert sum(taken) == 20
@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+import respx
+from httpx import Response
+
+from payman.core.exceptions.http import HttpStatusError
+from payman.core.http.client import AsyncHttpClient
+from payman.core.http.singleflight import SingleFlight, request_key
+
+
+def test_request_key_is_canonical():
+    assert request_key("post", "http://t/v", {"a": 1, "b": 2}) == request_key(
+        "POST", "http://t/v", {"b": 2, "a": 1}
+    )
+    assert request_key("POST", "http://t/v", {"a": 1}) != request_key("POST", "http://t/v", {"a": 2})
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_identical_concurrent_calls_share_one_request():
+    async def slow_response(request):
+        await asyncio.sleep(0.01)
+        return Response(200, json={"track_id": 1})
+
+    route = respx.post("http://test/verify").mock(side_effect=slow_response)
+    group = SingleFlight()
+    clients = [AsyncHttpClient(base_url="http://test", single_flight=group) for _ in range(2)]
+
+    results = await asyncio.gather(
+        *(client.request("POST", "/verify", json_data={"track_id": 1}) for client in clients * 2)
+    )
+
+    assert route.call_count == 1
+    assert results == [{"track_id": 1}] * 4
+    assert (group.calls, group.shared) == (1, 3)
+    assert len(group) == 0
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_errors_are_shared_and_not_cached():
+    route = respx.post("http://test/verify").mock(return_value=Response(500))
+    client = AsyncHttpClient(base_url="http://test", single_flight=SingleFlight())
+
+    results = await asyncio.gather(
+        client.request("POST", "/verify", json_data={"track_id": 1}),
+        client.request("POST", "/verify", json_data={"track_id": 1}),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, HttpStatusError) for result in results)
+
+    with pytest.raises(HttpStatusError):
+        await client.request("POST", "/verify", json_data={"track_id": 1})
+    assert route.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_shared_call():
+    group = SingleFlight()
+    release = asyncio.Event()
+
+    async def call():
+        await release.wait()
+        return "done"
+
+    first = asyncio.create_task(group.do("k", call))
+    second = asyncio.create_task(group.do("k", call))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == "done"
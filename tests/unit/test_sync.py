@@ -0,0 +1,74 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from payman.core.gateways import wrapper
+from payman.core.gateways.sync import LoopThread, SyncGateway
+from payman.interfaces.gateway_base import GatewayInterface
+
+
+class DummyGateway(GatewayInterface):
+    merchant_id = "xyz"
+
+    def __init__(self):
+        self.loops = set()
+        self.threads = set()
+
+    async def initiate_payment(self, request=None, **kwargs):
+        return kwargs
+
+    async def verify_payment(self, request=None, **kwargs):
+        self.loops.add(asyncio.get_running_loop())
+        self.threads.add(threading.current_thread().name)
+        track_id = {**(request or {}), **kwargs}["track_id"]
+        if track_id == 0:
+            raise ValueError("bad track id")
+        await asyncio.sleep(0)
+        return {"verified": track_id}
+
+    def get_payment_redirect_url(self, token):
+        return f"https://gw/{token}"
+
+
+@pytest.fixture
+def loop_thread():
+    thread = LoopThread(name="payman-test-loop")
+    yield thread
+    thread.stop()
+
+
+def test_calls_run_on_one_persistent_loop(loop_thread):
+    gateway = DummyGateway()
+    pay = SyncGateway(gateway, loop_thread)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda i: pay.verify_payment(track_id=i), range(1, 9)))
+
+    assert results == [{"verified": i} for i in range(1, 9)]
+    assert len(gateway.loops) == 1
+    assert gateway.threads == {"payman-test-loop"}
+    assert pay.get_payment_redirect_url(5) == "https://gw/5"
+    assert pay.merchant_id == "xyz"
+
+
+def test_errors_propagate(loop_thread):
+    pay = SyncGateway(DummyGateway(), loop_thread)
+    with pytest.raises(ValueError):
+        pay.verify_payment(track_id=0)
+
+
+def test_async_iterators_become_generators(loop_thread):
+    pay = SyncGateway(DummyGateway(), loop_thread)
+    results = list(pay.verify_many([{"track_id": 1}, {"track_id": 2}], concurrency=2))
+
+    assert all(result.ok for result in results)
+    assert sorted(result.response["verified"] for result in results) == [1, 2]
+
+
+def test_payman_sync_wraps_gateway(monkeypatch):
+    monkeypatch.setattr(wrapper, "get_gateway_instance", lambda name, **kw: DummyGateway())
+    pay = wrapper.Payman.sync("dummy")
+    assert isinstance(pay, SyncGateway)
+    assert pay.initiate_payment(amount=100) == {"amount": 100}
@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+from payman.core.http.client import AsyncHttpClient
+from payman.core.http.concurrency import ConcurrencyLimiter
+from payman.core.http.metrics import MetricsHook, MetricsRegistry
+from payman.core.http.pool import close_shared_clients
+from payman.core.http.tracing import PhaseTimer
+
+BODY = b'{"result": 100}'
+received_heads = []
+
+
+async def handle(reader, writer):
+    while True:
+        head = await reader.readuntil(b"\r\n\r\n")
+        received_heads.append(head.lower())
+        length = 0
+        for line in head.split(b"\r\n"):
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":")[1])
+        await reader.readexactly(length)
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+            b"Content-Length: " + str(len(BODY)).encode() + b"\r\n\r\n" + BODY
+        )
+        await writer.drain()
+
+
+class CollectingHook(MetricsHook):
+    def __init__(self):
+        self.events = []
+
+    def on_request_start(self, event):
+        event.headers["traceparent"] = "00-abc-def-01"
+
+    def on_request_end(self, event):
+        self.events.append(event)
+
+
+@pytest.mark.asyncio
+async def test_phase_timer_accumulates_phases():
+    timer = PhaseTimer()
+    for name in (
+        "connection.connect_tcp.started",
+        "connection.connect_tcp.complete",
+        "http11.send_request_headers.started",
+        "http11.send_request_headers.complete",
+        "http11.receive_response_headers.started",
+        "http11.receive_response_headers.complete",
+        "http11.response_closed.started",
+    ):
+        await timer(name, {})
+
+    timings = timer.finish()
+    assert set(timings) == {"pool_wait", "connect", "send", "ttfb", "total"}
+    assert timings["total"] >= timings["connect"]
+
+
+@pytest.mark.asyncio
+async def test_trace_timings_reported_per_attempt():
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    hook = CollectingHook()
+    registry = MetricsRegistry()
+    client = AsyncHttpClient(
+        base_url=f"http://127.0.0.1:{port}", trace_timings=True, metrics_hooks=[hook, registry]
+    )
+
+    try:
+        assert await client.request("POST", "/verify", json_data={"trackId": 1}) == {"result": 100}
+        await client.request("POST", "/verify", json_data={"trackId": 1})
+    finally:
+        await close_shared_clients()
+        server.close()
+        await server.wait_closed()
+
+    first, second = (event.timings for event in hook.events)
+    assert {"pool_wait", "connect", "send", "ttfb", "body", "total"} <= set(first)
+    # The second attempt reuses the pooled keep-alive connection
+    assert "connect" not in second
+    assert "payman_request_phase_seconds_bucket" in registry.render_prometheus()
+    assert b"traceparent: 00-abc-def-01" in received_heads[-1]
+
+
+@pytest.mark.asyncio
+async def test_limiter_wait_is_reported_as_queue_wait():
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    hook = CollectingHook()
+    limiter = ConcurrencyLimiter(initial_limit=1, max_wait=None)
+    client = AsyncHttpClient(
+        base_url=f"http://127.0.0.1:{port}",
+        share_connections=False,
+        trace_timings=True,
+        metrics_hooks=[hook],
+        concurrency_limiter=limiter,
+    )
+
+    await limiter.acquire()
+    asyncio.get_running_loop().call_later(0.2, limiter.release, None)
+    try:
+        await client.request("POST", "/verify", json_data={"trackId": 1})
+    finally:
+        await client.close()
+        server.close()
+        await server.wait_closed()
+
+    timings = hook.events[0].timings
+    assert timings["queue_wait"] >= 0.15
+    assert timings["pool_wait"] < 0.15
+    assert timings["total"] < 0.15
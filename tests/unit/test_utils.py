@@ -1,6 +1,7 @@
-from pydantic import BaseModel
+import pytest
+from pydantic import BaseModel, ValidationError
 
-from payman.utils import to_model_instance
+from payman.utils import get_validator, parse_response, to_model_instance
 
 
 class DummyModel(BaseModel):
@@ -30,3 +31,22 @@ def test_to_model_instance_from_none_with_overrides():
     result = to_model_instance(None, DummyModel, x=10, y="hey")
     assert result.x == 10
     assert result.y == "hey"
+
+
+def test_to_model_instance_does_not_mutate_source():
+    source = {"x": 4}
+    to_model_instance(source, DummyModel, y="override")
+    assert source == {"x": 4}
+
+
+def test_validator_is_cached_per_model():
+    assert get_validator(DummyModel) is get_validator(DummyModel)
+
+
+def test_parse_response_modes():
+    assert parse_response({"x": "5"}, DummyModel).x == 5
+    with pytest.raises(ValidationError):
+        parse_response({"x": "5"}, DummyModel, mode="strict")
+    constructed = parse_response({"x": 6}, DummyModel, mode="construct")
+    assert constructed.x == 6
+    assert constructed.y == "default"
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from pydantic import BaseModel
+
+import payman
+from payman.core.gateways.register_gateway import _GATEWAY_REGISTRY
+from payman.core.http.client import AsyncHttpClient
+from payman.interfaces.gateway_base import GatewayInterface
+from payman.utils import _VALIDATORS
+
+
+class WarmRequest(BaseModel):
+    amount: int
+
+
+class WarmResponse(BaseModel):
+    track_id: int
+
+
+class WarmGateway(GatewayInterface[WarmRequest, WarmResponse]):
+    def __init__(self, base_url: str):
+        self.client = AsyncHttpClient(base_url, share_connections=False)
+
+    async def initiate_payment(self, request: WarmRequest | dict | None = None, **kwargs) -> WarmResponse:
+        raise NotImplementedError
+
+    async def verify_payment(self, request: WarmRequest | dict | None = None, **kwargs) -> WarmResponse:
+        raise NotImplementedError
+
+    def get_payment_redirect_url(self, token: str | int) -> str:
+        return f"https://pay.test/{token}"
+
+
+@pytest_asyncio.fixture
+async def server():
+    connections = []
+
+    async def handle(reader, writer):
+        connections.append(writer)
+        try:
+            while True:
+                await reader.readuntil(b"\r\n\r\n")
+                writer.write(b"HTTP/1.1 405 Method Not Allowed\r\nContent-Length: 0\r\n\r\n")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    srv = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = srv.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}/v1", connections
+    srv.close()
+
+
+@pytest.mark.asyncio
+async def test_client_warmup_opens_pooled_connections(server):
+    base_url, connections = server
+    client = AsyncHttpClient(base_url, share_connections=False, max_keepalive_connections=3)
+
+    # Capped by the keep-alive limit, extra connections would be closed anyway
+    assert await client.warmup(connections=5) == 3
+    assert len(connections) == 3
+    assert await client.warmup(connections=2) == 2
+    # Idle keep-alive connections are reused rather than reopened
+    assert len(connections) == 3
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_client_warmup_reports_unreachable_host():
+    client = AsyncHttpClient("http://127.0.0.1:9", share_connections=False, timeout=1)
+
+    assert await client.warmup(connections=2) == 0
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_gateway_warmup_builds_validators_and_connects(server):
+    base_url, connections = server
+    gateway = WarmGateway(base_url)
+    _VALIDATORS.pop(WarmRequest, None)
+    _VALIDATORS.pop(WarmResponse, None)
+
+    assert gateway.models() == {WarmRequest, WarmResponse}
+    assert await gateway.warmup(connections=2) == 2
+    assert WarmRequest in _VALIDATORS and WarmResponse in _VALIDATORS
+    assert len(connections) == 2
+    await gateway.client.close()
+
+
+@pytest.mark.asyncio
+async def test_module_warmup_imports_named_gateways(server, monkeypatch):
+    base_url, _ = server
+    monkeypatch.setitem(_GATEWAY_REGISTRY, "warm", "tests.unit.test_warmup.WarmGateway")
+    gateway = WarmGateway(base_url)
+
+    assert await payman.warmup(["warm", gateway], connections=1) == [0, 1]
+    assert _GATEWAY_REGISTRY["warm"] is WarmGateway
+    await gateway.client.close()